@@ -0,0 +1,158 @@
+"""
+Benchmarks of the normalization functions.
+
+    python benchmarks/bench_normalize.py --sizes 10000 1000000 \
+        --output results.json --compare previous.json
+
+For each function and size, it reports the per-call latency percentiles
+(p50, p90, p99, in microseconds) and the throughput (calls per second)
+on a synthetic corpus (see corpus.py), and saves the results as JSON so
+that runs can be compared over time.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import shipdataprocess  # noqa: E402
+from shipdataprocess.normalize import (  # noqa: E402
+    normalize_callsign,
+    normalize_shipname,
+)
+from corpus import generate_callsigns, generate_shipnames  # noqa: E402
+
+#
+# Functions to benchmark with the corpus they run on
+BENCHMARKS = {
+    "normalize_shipname": (normalize_shipname, generate_shipnames),
+    "normalize_callsign": (normalize_callsign, generate_callsigns),
+}
+
+
+def percentile(sorted_values, q):
+    """
+    Return the q-th percentile (0-100) of already sorted values
+    """
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (
+        sorted_values[upper] - sorted_values[lower]
+    ) * (k - lower)
+
+
+def run_benchmark(func, values):
+    """
+    Time every call of func on values, then time the whole batch once
+    more without the per-call timer
+
+    :return: Dict, latency percentiles in microseconds and throughput
+    """
+    timer = time.perf_counter_ns
+    latencies = []
+    for value in values:
+        start = timer()
+        func(value)
+        latencies.append(timer() - start)
+    latencies.sort()
+
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "n": len(values),
+        "p50_us": percentile(latencies, 50) / 1000.0,
+        "p90_us": percentile(latencies, 90) / 1000.0,
+        "p99_us": percentile(latencies, 99) / 1000.0,
+        "max_us": latencies[-1] / 1000.0 if latencies else float("nan"),
+        "mean_us": elapsed / len(values) * 1e6 if values else float("nan"),
+        "calls_per_s": len(values) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def compare(results, previous):
+    """
+    Print the throughput of each benchmark relative to a previous run
+    """
+    before = {(r["function"], r["n"]): r for r in previous["results"]}
+    for r in results:
+        old = before.get((r["function"], r["n"]))
+        if old is None:
+            continue
+        print(
+            "%-24s n=%-9d throughput x%.2f  p50 %.2f -> %.2f us"
+            % (
+                r["function"],
+                r["n"],
+                r["calls_per_s"] / old["calls_per_s"],
+                old["p50_us"],
+                r["p50_us"],
+            )
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 1000000]
+    )
+    parser.add_argument(
+        "--functions", nargs="+", choices=sorted(BENCHMARKS),
+        default=sorted(BENCHMARKS),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="save the results to this JSON")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.functions:
+        func, generate = BENCHMARKS[name]
+        for n in args.sizes:
+            values = generate(n, seed=args.seed)
+            result = run_benchmark(func, values)
+            result["function"] = name
+            results.append(result)
+            print(
+                "%-24s n=%-9d p50 %7.2f us  p90 %7.2f us  p99 %7.2f us  "
+                "%10.0f calls/s"
+                % (
+                    name,
+                    n,
+                    result["p50_us"],
+                    result["p90_us"],
+                    result["p99_us"],
+                    result["calls_per_s"],
+                )
+            )
+
+    report = {
+        "date": datetime.datetime.now().isoformat(),
+        "version": shipdataprocess.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    main()
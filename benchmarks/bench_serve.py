@@ -0,0 +1,151 @@
+"""
+Load test of the normalization server (shipdataprocess serve).
+
+    python benchmarks/bench_serve.py --clients 64 --duration 10 --workers 2
+
+starts a server on a free local port (or targets --url), then runs the
+given number of concurrent keep-alive clients, each sending one ship name
+per request for the given duration. It reports the client-side latency
+percentiles (p50, p90, p99, in milliseconds), the throughput in requests
+per second and the statistics of the server (mean batch size, p50/p99).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shipdataprocess.server import NormalizationServer  # noqa: E402
+from corpus import generate_shipnames  # noqa: E402
+from bench_normalize import percentile  # noqa: E402
+
+
+async def _request(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        (
+            "POST %s HTTP/1.1\r\nHost: %s\r\n"
+            "Content-Type: application/json\r\nContent-Length: %d\r\n\r\n"
+            % (path, host, len(body))
+        ).encode("latin-1")
+        + body
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.decode("latin-1").split("\r\n"):
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, names, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    while time.perf_counter() < deadline:
+        name = names[i % len(names)]
+        i += 1
+        start = time.perf_counter()
+        await _request(
+            reader, writer, host, "/normalize_shipname", {"value": name}
+        )
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def run_load(host, port, clients, duration, names):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            _client(host, port, names[i::clients], deadline, latencies)
+            for i in range(clients)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000.0,
+        "p90_ms": percentile(latencies, 90) * 1000.0,
+        "p99_ms": percentile(latencies, 99) * 1000.0,
+        "requests_per_s": len(latencies) / elapsed,
+        "server": await _stats(host, port),
+    }
+
+
+async def _main(args):
+    names = [
+        x for x in generate_shipnames(100000, seed=args.seed)
+        if isinstance(x, str)
+    ]
+    server = None
+    if args.url:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port
+    else:
+        server = NormalizationServer(
+            port=0,
+            workers=args.workers,
+            max_batch_size=args.max_batch_size,
+            max_delay=args.max_delay_ms / 1000.0,
+        )
+        await server.start()
+        host, port = server.host, server.port
+    try:
+        result = await run_load(host, port, args.clients, args.duration, names)
+    finally:
+        if server is not None:
+            await server.close()
+    print(
+        "%d clients: %.0f requests/s  p50 %.2f ms  p90 %.2f ms  p99 %.2f ms"
+        "  mean batch %.1f"
+        % (
+            result["clients"],
+            result["requests_per_s"],
+            result["p50_ms"],
+            result["p90_ms"],
+            result["p99_ms"],
+            result["server"]["mean_batch_size"],
+        )
+    )
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", help="server to load, instead of a new one")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=1000)
+    parser.add_argument("--max-delay-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="save the results to this JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_main(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Seeded generator of synthetic ship names and call signs for benchmarks.
+
+Names are built from common vessel name stems and decorated the way they
+show up in AIS messages and registries: vessel type prefixes (F/V, M/V,
+KM...), roman numerals, numbers in letters (English, Spanish, French),
+hull numbers, Korean/Chinese HO/HAO suffixes, parentheses, names in
+non-Latin scripts, bytes encoded in utf-8 or iso-8859-1, and integers.
+"""
+
+import random
+
+STEMS = [
+    "OCEAN STAR", "LUCKY", "SANTA MARIA", "XIN HAI", "LONG XING", "FU YUAN YU",
+    "JIN HAI", "SEA LION", "NORTHERN PRIDE", "AGUILA", "VIRGEN DEL CARMEN",
+    "ESTRELLA DEL MAR", "SAINT PIERRE", "PETIT PRINCE", "KAIYO MARU",
+    "SHIN SEI MARU", "DONG WON", "OYANG", "ATLANTIC", "PACIFIC QUEEN",
+    "BLACK & WHITE", "STA. ISABEL", "STA ROSA", "NUESTRA SENORA", "ZHOU YU",
+    "LU RONG YUAN YU", "HAI FENG", "GOLDEN DRAGON", "SILVER SEA", "NORDIC",
+    "MARE NOSTRUM", "AMAZONAS", "KOTA", "BINTANG LAUT", "SINAR", "TUNA KING",
+]
+
+PREFIXES = [
+    "MFV", "MPV", "HMS", "LPG/C", "LNG", "F/V", "FV", "F.V.", "F-V", "FV:",
+    "F/B", "FB", "M/P", "MP", "M/B", "MB", "G/V", "SF G/V", "M/V", "MV",
+    "M.V.", "M/S", "M.S.", "M/K", "MK", "R/V", "RV", "T/T", "S/Y", "M/F",
+    "S/S", "SS", "S/V", "M/T", "MT", "M/Y", "A/B", "KM", "K.M.", "E.B.",
+]
+
+NUMBER_WORDS = [
+    "ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN", "EIGHT", "NINE",
+    "TEN", "ELEVEN", "TWELVE", "THIRTEEN", "FOURTEEN", "FIFTEEN",
+    "UNO", "DOS", "TRES", "CUATRO", "CINCO", "SEIS", "SIETE", "OCHO",
+    "NUEVE", "DIEZ", "ONCE", "DOCE", "TRECE", "CATORCE", "QUINCE",
+    "UN", "DEUX", "TROIS", "QUATRE", "CINQ", "SEPT", "HUIT", "NEUF",
+    "DIX", "ONZE", "DOUZE", "TREIZE", "QUATORZE", "QUINZE",
+]
+
+ROMAN_NUMERALS = [
+    "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII",
+    "XIV", "XIX", "XX", "XXIV", "XXXIX",
+]
+
+ORDINALS = ["1ST", "2ND", "3RD", "4TH", "5TH"]
+
+NON_LATIN = [
+    "大洋渔业", "鲁荣远渔", "浙岭渔", "제3오룡호", "동원호", "第八 金比羅丸",
+    "НОВЫЙ ПУТЬ", "КАПИТАН ДРАНИЦЫН", "ΑΓΙΟΣ ΝΙΚΟΛΑΟΣ", "البحر",
+    "ÆGIR", "SÆBJØRG", "ÅLESUND", "ÇEŞME", "NUESTRA SEÑORA",
+]
+
+CALLSIGN_PLACEHOLDERS = ["NONE", "UNKNOWN", "NIL", "NULL", ""]
+
+
+def _decorate(rng, stem):
+    """
+    Return the stem with random decorations around it
+    """
+    name = stem
+    roll = rng.random()
+    if roll < 0.25:
+        name = "%s %s" % (rng.choice(PREFIXES), name)
+    elif roll < 0.30:
+        name = "%s %s" % (name, rng.choice(PREFIXES))
+
+    roll = rng.random()
+    if roll < 0.15:
+        name = "%s %s" % (name, rng.choice(ROMAN_NUMERALS))
+    elif roll < 0.25:
+        name = "%s %s" % (name, rng.choice(NUMBER_WORDS))
+    elif roll < 0.55:
+        number = rng.choice(["%d", "NO.%d", "NO %d", "N-%d", "%03d"])
+        name = "%s %s" % (name, number % rng.randint(1, 999))
+    elif roll < 0.60:
+        name = "%s %s" % (rng.choice(ORDINALS), name)
+    elif roll < 0.66:
+        suffix = rng.choice(["HO", "HAO"])
+        name = "%s %d %s" % (name, rng.randint(1, 99), suffix)
+    elif roll < 0.68:
+        name = "%d %s" % (rng.randint(1, 99), name)
+
+    if rng.random() < 0.04:
+        name = "%s (EX %s)" % (name, rng.choice(STEMS))
+    if rng.random() < 0.2:
+        name = name.lower()
+    if rng.random() < 0.05:
+        name = "  %s\t" % name.replace(" ", "  ")
+    return name
+
+
+def generate_shipnames(n, seed=0):
+    """
+    Return a list of n synthetic ship names of mixed types
+
+    :param n: Integer, number of names
+    :param seed: Integer, seed of the random generator
+    :return: List of strings, bytes, integers and None
+    """
+    rng = random.Random(seed)
+    names = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.02:
+            names.append(None)
+        elif roll < 0.03:
+            names.append(rng.randint(1, 99999))
+        elif roll < 0.08:
+            names.append(_decorate(rng, rng.choice(NON_LATIN)))
+        elif roll < 0.10:
+            name = _decorate(rng, rng.choice(NON_LATIN + STEMS))
+            encoding = rng.choice(["utf-8", "iso-8859-1"])
+            names.append(name.encode(encoding, "ignore"))
+        else:
+            names.append(_decorate(rng, rng.choice(STEMS)))
+    return names
+
+
+def generate_callsigns(n, seed=0):
+    """
+    Return a list of n synthetic call signs
+
+    :param n: Integer, number of call signs
+    :param seed: Integer, seed of the random generator
+    :return: List of strings and None
+    """
+    rng = random.Random(seed)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    callsigns = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.02:
+            callsigns.append(None)
+        elif roll < 0.06:
+            callsigns.append(rng.choice(CALLSIGN_PLACEHOLDERS))
+        else:
+            callsign = "".join(
+                rng.choice(letters + "0123456789")
+                for _ in range(rng.randint(3, 7))
+            )
+            roll = rng.random()
+            if roll < 0.1:
+                callsign = "00" + callsign
+            elif roll < 0.2:
+                callsign = callsign[:2] + rng.choice(["-", " ", ".", "/"]) + (
+                    callsign[2:]
+                )
+            elif roll < 0.3:
+                callsign = callsign.lower()
+            callsigns.append(callsign)
+    return callsigns
@@ -21,9 +21,13 @@ setup(
     author=package.__author__,
     author_email=package.__email__,
     description=package.__doc__.strip(),
+    entry_points={
+        "console_scripts": ["shipdataprocess = shipdataprocess.cli:main"]
+    },
     include_package_data=True,
     install_requires=DEPENDENCIES,
-    python_requires=">=3.6",
+    extras_require={"arrow": ["pyarrow"]},
+    python_requires=">=3.7",
     keywords=["ship", "vessel", "fishing", "normalization"],
     license="Apache 2.0",
     long_description=readme,
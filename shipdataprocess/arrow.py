@@ -0,0 +1,276 @@
+"""
+This file provides versions of normalize_shipname() and normalize_callsign()
+that take and return Arrow arrays, as read from Parquet files, without
+converting them to pandas object columns. Plain ASCII values that no rule
+can change beyond case, white spaces, special characters and digits are
+normalized with Arrow compute kernels and never become Python strings;
+only the other values go through the Python rules. Nulls stay nulls in
+the validity bitmap of the result. Results are identical to applying the
+scalar functions value by value. Binary arrays of call signs are
+normalized as NumPy arrays of their bytes.
+
+pyarrow is optional: without it, or for inputs that are not Arrow arrays,
+the functions take any sequence and return a list.
+"""
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+from .batch import (
+    CALLSIGN_PLACEHOLDERS,
+    decode_callsign,
+    normalize_callsign_codes,
+    normalize_callsign_list,
+    normalize_shipname_list,
+    normalize_shipname_parts_list,
+)
+from .normalize import (
+    SHIPNAME_ENGINE,
+    SHIPNAME_PREFIX_START_TRIGGER,
+    SHIPNAME_PREFIX_TRIGGER,
+    ShipnameParts,
+)
+
+#
+# White spaces of str.split() in ASCII, collapsed to one space
+_WHITE_SPACES = r"[\t\n\x0b\x0c\r\x1c-\x1f ]+"
+
+#
+# Names made of these characters only, that none of these patterns of the
+# rules match, are the same as their cleaned upper case version without
+# the spaces, with the leading digits moved to the end and the 0s of the
+# trailing number removed. Arrow regular expressions (RE2) have no
+# lookarounds, so the infix rules are matched with what they look for.
+_SIMPLE_SHIPNAME = r"^[A-Z0-9 ]*$"
+_SHIPNAME_RULE_PATTERNS = (
+    r"^(?:%s)" % SHIPNAME_PREFIX_START_TRIGGER,
+    SHIPNAME_PREFIX_TRIGGER,
+    r" (?:%s)$" % "|".join(SHIPNAME_ENGINE.number_words),
+    "|".join(SHIPNAME_ENGINE.ordinals),
+    SHIPNAME_ENGINE.suffix_pattern.pattern,
+    r"NO[^\w\s]*\s*\d",
+    r"\sN[\W_0]*\d",
+    r"(?:^|\s)STA(?:\s|$)",
+    r"(?:^| )(?:%s)$" % "|".join(SHIPNAME_ENGINE.roman_numerals),
+)
+
+
+def _is_arrow(values):
+    return pa is not None and isinstance(values, (pa.Array, pa.ChunkedArray))
+
+
+def _is_binary(data_type):
+    return (
+        pa.types.is_binary(data_type)
+        or pa.types.is_large_binary(data_type)
+        or pa.types.is_fixed_size_binary(data_type)
+    )
+
+
+def _apply(values, kernel, python_function, binary_kernel=None):
+    """
+    Run kernel on each chunk of a string array (or binary_kernel on each
+    chunk of a binary array), or python_function on the values of arrays
+    of other types, and return a string array of the same length
+    """
+    if isinstance(values, pa.ChunkedArray):
+        return pa.chunked_array(
+            [
+                _apply(chunk, kernel, python_function, binary_kernel)
+                for chunk in values.chunks
+            ],
+            type=pa.string(),
+        )
+    if pa.types.is_dictionary(values.type):
+        #
+        # Normalize each distinct value once
+        return _apply(
+            values.dictionary, kernel, python_function, binary_kernel
+        ).take(values.indices)
+    if pa.types.is_string(values.type) or pa.types.is_large_string(
+        values.type
+    ):
+        return kernel(values.cast(pa.string()), python_function)
+    if binary_kernel is not None and _is_binary(values.type):
+        return binary_kernel(values.cast(pa.large_binary()), python_function)
+    return pa.array(python_function(values.to_pylist()), type=pa.string())
+
+
+def _merge(values, result, slow, python_function):
+    """
+    Replace the result of the values selected by the boolean array slow
+    with python_function of them, and turn empty results to nulls
+    """
+    if pc.any(slow).as_py():
+        slow_values = python_function(values.filter(slow).to_pylist())
+        result = pc.replace_with_mask(
+            result, slow, pa.array(slow_values, type=pa.string())
+        )
+    return pc.if_else(
+        pc.equal(result, ""), pa.scalar(None, pa.string()), result
+    )
+
+
+def _shipname_kernel(values, python_function):
+    names = pc.ascii_upper(values)
+    names = pc.replace_substring_regex(names, _WHITE_SPACES, " ")
+    names = pc.ascii_trim(names, " ")
+
+    fast = pc.and_(
+        pc.string_is_ascii(values),
+        pc.match_substring_regex(names, _SIMPLE_SHIPNAME),
+    )
+    for pattern in _SHIPNAME_RULE_PATTERNS:
+        fast = pc.and_not(fast, pc.match_substring_regex(names, pattern))
+    slow = pc.invert(fast.fill_null(True))
+    slow = pc.and_(slow, pc.is_valid(values))
+
+    #
+    # Remove the spaces, move leading digits to the end and remove
+    # 0s from the number at the end starting with 0s
+    result = pc.replace_substring(names, " ", "")
+    result = pc.replace_substring_regex(result, r"^(\d+)(\D.*)$", r"\2\1")
+    result = pc.replace_substring_regex(result, r"^(|.*\D)0+(\d*)$", r"\1\2")
+    return _merge(values, result, slow, python_function)
+
+
+def _callsign_kernel(values, python_function):
+    placeholder = pc.is_in(values, value_set=pa.array(CALLSIGN_PLACEHOLDERS))
+    ascii_values = pc.string_is_ascii(values)
+    slow = pc.and_(
+        pc.invert(ascii_values).fill_null(False), pc.invert(placeholder)
+    )
+
+    #
+    # In ASCII, white spaces and all characters but letters and
+    # digits are removed anyway
+    result = pc.ascii_upper(values)
+    result = pc.replace_substring_regex(result, r"[^A-Z0-9]", "")
+    result = pc.replace_substring_regex(result, r"^0+", "")
+    result = pc.if_else(placeholder, pa.scalar(None, pa.string()), result)
+    return _merge(values, result, slow, python_function)
+
+
+def _binary_codes(values):
+    """
+    Return the bytes of the valid values of a large binary array as the
+    rows of a 2D array padded with 0s
+    """
+    offsets = np.frombuffer(values.buffers()[1], dtype=np.int64)[
+        values.offset:values.offset + len(values) + 1
+    ]
+    lengths = np.diff(offsets)
+    if values.null_count:
+        lengths = np.where(
+            values.is_valid().to_numpy(zero_copy_only=False), lengths, 0
+        )
+    width = int(lengths.max()) if len(lengths) else 0
+    codes = np.zeros((len(values), width), dtype=np.uint8)
+    filled = np.arange(width) < lengths[:, None]
+    if filled.any():
+        data = np.frombuffer(values.buffers()[2], dtype=np.uint8)
+        positions = offsets[:-1, None] + np.arange(width)
+        codes[filled] = data[positions[filled]]
+    return codes
+
+
+def _callsign_binary_kernel(values, python_function):
+    placeholder = pc.is_in(
+        values,
+        value_set=pa.array(
+            [x.encode("ascii") for x in CALLSIGN_PLACEHOLDERS],
+            type=pa.large_binary(),
+        ),
+    ).to_numpy(zero_copy_only=False)
+    codes = _binary_codes(values)
+    slow = (codes >= 0x80).any(axis=1) & ~placeholder
+
+    #
+    # Build the strings of the normalized codes, empty for placeholders
+    # and nulls
+    result, lengths = normalize_callsign_codes(codes)
+    lengths[placeholder | slow] = 0
+    filled = np.arange(codes.shape[1]) < lengths[:, None]
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    result = pa.StringArray.from_buffers(
+        len(values), pa.py_buffer(offsets), pa.py_buffer(result[filled])
+    )
+    return _merge(
+        values,
+        result,
+        pa.array(slow),
+        lambda callsigns: python_function(
+            [decode_callsign(x) for x in callsigns]
+        ),
+    )
+
+
+def normalize_shipname_arrow(values):
+    """
+    Return normalized ship names of an Arrow array, the same as
+    normalize_shipname() returns for each value
+
+    :param values: pyarrow Array or ChunkedArray of strings (or of any
+    type normalize_shipname() supports), or any sequence
+    :return: pyarrow string Array or ChunkedArray with nulls where there is
+    no normalized name, or a list if values is not an Arrow array
+    """
+    if not _is_arrow(values):
+        return normalize_shipname_list(list(values))
+    return _apply(values, _shipname_kernel, normalize_shipname_list)
+
+
+def _parts_struct(values):
+    parts = normalize_shipname_parts_list(values.to_pylist())
+    return pa.StructArray.from_arrays(
+        [
+            pa.array([p[i] for p in parts], type=pa.string())
+            for i in range(len(ShipnameParts._fields))
+        ],
+        names=list(ShipnameParts._fields),
+    )
+
+
+def normalize_shipname_parts_arrow(values):
+    """
+    Return normalized ship names of an Arrow array with their parts, the
+    same as normalize_shipname_parts() returns for each value
+
+    :param values: pyarrow Array or ChunkedArray, or any sequence
+    :return: pyarrow struct Array or ChunkedArray with string fields name,
+    stem, number, prefix and parenthetical, or a list of ShipnameParts if
+    values is not an Arrow array
+    """
+    if not _is_arrow(values):
+        return normalize_shipname_parts_list(list(values))
+    if isinstance(values, pa.ChunkedArray):
+        chunks = [_parts_struct(chunk) for chunk in values.chunks]
+        return pa.chunked_array(chunks, type=_parts_struct(values[:0]).type)
+    return _parts_struct(values)
+
+
+def normalize_callsign_arrow(values):
+    """
+    Return normalized call signs of an Arrow array, the same as
+    normalize_callsign() returns for each value
+
+    :param values: pyarrow Array or ChunkedArray of strings, or of binary
+    values taken as UTF-8 (or ISO-8859-1) text, or any sequence
+    :return: pyarrow string Array or ChunkedArray with nulls where there is
+    no normalized call sign, or a list if values is not an Arrow array
+    """
+    if not _is_arrow(values):
+        return normalize_callsign_list(list(values))
+    return _apply(
+        values,
+        _callsign_kernel,
+        normalize_callsign_list,
+        binary_kernel=_callsign_binary_kernel,
+    )
@@ -0,0 +1,207 @@
+"""
+This file provides coarse blocking keys for entity resolution of vessels.
+Records that share a key are candidates to be the same vessel, so they
+can be paired with a hash join on the key instead of comparing every pair
+of records. Keys are deliberately less precise than normalized names, so
+that variants of a name share them:
+
+- the consonant skeleton of the normalized name without its number
+  (OCEANSTAR2 -> OCNSTR),
+- its phonetic code, Soundex digits without length limit
+  (OCEANSTAR2 -> O25236),
+- the sorted tokens of the original name without its vessel type code
+  and parentheses (F/V STAR OCEAN (EX SEA LION) -> OCEAN STAR),
+- the normalized name split into its stem and its numeric suffix
+  (OCEANSTAR12 -> OCEANSTAR, 12),
+- the normalized call sign with the characters often mistaken for one
+  another folded together (0 and O, 1 and I, 5 and S, 8 and B).
+
+blocking_keys() computes all of them over whole columns, each distinct
+value only once.
+
+    keys = blocking_keys(df.shipname, df.callsign)
+    candidates = keys.reset_index().merge(
+        keys.reset_index(), on="skeleton"
+    )
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .batch import normalize_column
+from .normalize import (
+    DIGITS,
+    SHIPNAME_ENGINE,
+    SHIPNAME_INFIX_RULES,
+    Rule,
+    decode_shipname,
+)
+
+VOWELS = "AEIOUY"
+
+SOUNDEX_CODES = {
+    letter: str(digit)
+    for digit, letters in enumerate(
+        ("AEIOUY", "BFPV", "CGJKQSXZ", "DT", "L", "MN", "R")
+    )
+    for letter in letters
+}
+
+CALLSIGN_CONFUSABLES = str.maketrans("0158", "OISB")
+
+_REPEATS = re.compile(r"(.)\1+")
+_NOT_VOWELS = {ord(c): None for c in VOWELS}
+
+#
+# The rules of normalize_shipname() removing NO. and N before numbers,
+# leaving the number as a word of its own. NO must start a word, so that
+# words ending with NO keep their letters (NINO 2).
+_NUMBER_MARKER_RULES = tuple(
+    Rule(
+        rule.name,
+        (r"(?<![A-Z])" if rule.source.startswith("NO") else "") + rule.source,
+        " ",
+        needles=rule.needles,
+    )
+    for rule in SHIPNAME_INFIX_RULES
+    if rule.name in ("NO_DIGITS", "N_DIGITS", "NO_DOT")
+)
+
+
+def split_number(name):
+    """
+    Split a normalized name into its stem and its numeric suffix
+
+    :param name: String, a normalized vessel name
+    :return: Tuple of strings, (stem, number), None where empty
+    """
+    if not isinstance(name, str):
+        return None, None
+    stem = name.rstrip(DIGITS)
+    return stem or None, name[len(stem):] or None
+
+
+def consonant_skeleton(name):
+    """
+    Return the first letter and the following consonants of the stem of a
+    normalized name, with repeated letters collapsed
+
+    :param name: String, a normalized vessel name
+    :return: String, or None for nulls
+    """
+    stem = split_number(name)[0]
+    if stem is None:
+        return name if isinstance(name, str) else None
+    skeleton = stem[0] + stem[1:].translate(_NOT_VOWELS)
+    return _REPEATS.sub(r"\1", skeleton)
+
+
+def phonetic_code(name):
+    """
+    Return the Soundex code of the stem of a normalized name, without
+    truncation: the first letter and the digits of the sounds that follow
+    it, with repeated sounds collapsed
+
+    :param name: String, a normalized vessel name
+    :return: String, or None for nulls
+    """
+    stem = split_number(name)[0]
+    if stem is None:
+        return name if isinstance(name, str) else None
+    code = [stem[0]]
+    previous = SOUNDEX_CODES.get(stem[0])
+    for char in stem[1:]:
+        digit = SOUNDEX_CODES.get(char)
+        if digit is None:
+            #
+            # H, W and the digits do not separate equal sounds
+            continue
+        if digit != previous and digit != "0":
+            code.append(digit)
+        previous = digit
+    return "".join(code)
+
+
+def sorted_tokens(shipname):
+    """
+    Return the words of an original vessel name cleaned of special
+    characters and sorted, so that the order of the words does not matter.
+    The vessel type codes, the text in parentheses and the NO. before
+    numbers are removed first, with the rules of normalize_shipname().
+
+    :param shipname: String, an original vessel name
+    :return: String, sorted words joined by spaces, or None
+    """
+    if (shipname is None) or (shipname != shipname) or (shipname == ""):
+        return None
+    text = decode_shipname(shipname)
+    if text is None:
+        return None
+    engine = SHIPNAME_ENGINE
+    text = engine.clean(text)
+    if engine.has_prefix(text):
+        text = engine.apply_rules(text, engine.prefix_rules)
+    text = engine.apply_rules(text, engine.parentheses_rules)
+    text = engine.apply_rules(text, _NUMBER_MARKER_RULES)
+    tokens = [engine.remove_special_chars(token) for token in text.split()]
+    return " ".join(sorted(token for token in tokens if token)) or None
+
+
+def callsign_key(callsign):
+    """
+    Return a normalized call sign with 0, 1, 5 and 8 turned into O, I, S
+    and B
+
+    :param callsign: String, a normalized call sign
+    :return: String, or None for nulls
+    """
+    if not isinstance(callsign, str):
+        return None
+    return callsign.translate(CALLSIGN_CONFUSABLES)
+
+
+def _map_distinct(values, function):
+    """
+    Return an object array of function applied to each distinct value
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    results = np.array([None] + [function(x) for x in uniques], dtype=object)
+    return results[codes + 1]
+
+
+def blocking_keys(shipnames=None, callsigns=None, normalized=False):
+    """
+    Compute the blocking keys of columns of ship names and call signs
+
+    :param shipnames: Pandas Series, List or Array of vessel names
+    :param callsigns: Pandas Series, List or Array of call signs
+    :param normalized: Boolean, the ship names and call signs are already
+    normalized with normalize_shipname() and normalize_callsign(). The
+    sorted tokens need the original names and are left out.
+    :return: Pandas DataFrame with columns skeleton, phonetic, tokens, stem
+    and number for ship names, and callsign for call signs, with None
+    where there is no key
+    """
+    index = None
+    for values in (shipnames, callsigns):
+        if isinstance(values, pd.Series):
+            index = values.index
+    keys = {}
+    if shipnames is not None:
+        if normalized:
+            names = pd.Series(shipnames, dtype=object).to_numpy()
+        else:
+            names = normalize_column(shipnames, kind="shipname").to_numpy()
+        keys["skeleton"] = _map_distinct(names, consonant_skeleton)
+        keys["phonetic"] = _map_distinct(names, phonetic_code)
+        if not normalized:
+            keys["tokens"] = _map_distinct(shipnames, sorted_tokens)
+        keys["stem"] = _map_distinct(names, lambda x: split_number(x)[0])
+        keys["number"] = _map_distinct(names, lambda x: split_number(x)[1])
+    if callsigns is not None:
+        if not normalized:
+            callsigns = normalize_column(callsigns, kind="callsign")
+        keys["callsign"] = _map_distinct(callsigns, callsign_key)
+    return pd.DataFrame(keys, index=index, dtype=object)
@@ -0,0 +1,522 @@
+"""
+This file provides opt-in caches for the normalization and standardization
+functions. Values such as ship names or call signs arrive again and again
+in vessel tracking data, so remembering the results of recent values saves
+most of the work when values cannot be processed in batches.
+
+PersistentCache keeps the results in a SQLite file shared across runs and
+processes. It is tied to a hash of the rules (see rules_version()), so
+that changing any rule empties it.
+"""
+
+from collections import OrderedDict, namedtuple
+import functools
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+
+from . import __version__, batch, normalize, standardize, transliterate
+from .batch import LIST_FUNCTIONS
+from .normalize import normalize_callsign, normalize_shipname
+from .standardize import standardize_imo, standardize_owner
+
+try:
+    from importlib.metadata import version as _package_version
+except ImportError:
+    _package_version = None
+
+DEFAULT_MAXSIZE = 100000
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+class LRUCache(object):
+    """
+    Thread-safe mapping of a bounded size that evicts the least recently
+    used entries first, and counts hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Return the cached value of key, or default if it is not cached
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Cache value under key, evicting the least recently used entry
+        if the cache is full
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            self._data[key] = value
+
+    def info(self):
+        """
+        :return: CacheInfo, the counters and the size of the cache
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._data),
+            )
+
+    def clear(self, stats=True):
+        """
+        Remove all entries, and reset the counters unless stats is False
+        """
+        with self._lock:
+            self._data.clear()
+            if stats:
+                self.hits = 0
+                self.misses = 0
+                self.evictions = 0
+
+
+_MISSING = object()
+
+
+class MemoizedFunction(object):
+    """
+    Wrap a function of one value (and optional extra arguments) with an
+    LRUCache. The type of the value is part of the cache key, so that
+    1, 1.0, True and "1" are cached separately as the wrapped functions
+    treat them differently. Values that cannot be cached (nulls and
+    unhashable values such as Pandas Series) are passed through.
+    """
+
+    def __init__(self, func, maxsize=DEFAULT_MAXSIZE):
+        self.func = func
+        self.cache = LRUCache(maxsize)
+        self.__name__ = getattr(func, "__name__", "memoized")
+        self.__doc__ = func.__doc__
+
+    def __call__(self, value, *args, **kwargs):
+        try:
+            if value != value:
+                return self.func(value, *args, **kwargs)
+            key = (type(value), value, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except (TypeError, ValueError):
+            return self.func(value, *args, **kwargs)
+
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = self.func(value, *args, **kwargs)
+            self.cache.put(key, result)
+        return result
+
+    def cache_info(self):
+        """
+        :return: CacheInfo, hits, misses, evictions and sizes of the cache
+        """
+        return self.cache.info()
+
+    def cache_clear(self, stats=True):
+        """
+        Empty the cache, and reset its counters unless stats is False
+        """
+        self.cache.clear(stats)
+
+
+def memoize(func, maxsize=DEFAULT_MAXSIZE):
+    """
+    Return a memoized variant of func with a cache of at most maxsize values
+
+    :param func: Function, a normalization or standardization function
+    :param maxsize: Integer, maximum number of values to remember
+    :return: MemoizedFunction
+    """
+    return MemoizedFunction(func, maxsize)
+
+
+normalize_shipname_cached = memoize(normalize_shipname)
+normalize_callsign_cached = memoize(normalize_callsign)
+standardize_imo_cached = memoize(standardize_imo)
+standardize_owner_cached = memoize(standardize_owner)
+
+
+@functools.lru_cache(maxsize=None)
+def rules_version():
+    """
+    Return a hash of everything that decides the normalized values: the
+    source of the modules holding the rules and the version of unidecode.
+    Packages installed without their sources (compiled files only) are
+    identified by their version instead.
+
+    :return: String, hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    try:
+        for module in (normalize, standardize, transliterate, batch):
+            digest.update(inspect.getsource(module).encode("utf-8"))
+    except (OSError, TypeError):
+        digest = hashlib.sha256()
+        digest.update(("shipdataprocess " + __version__).encode("utf-8"))
+    if _package_version is not None:
+        digest.update(_package_version("unidecode").encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+DEFAULT_PERSISTENT_MAXSIZE = 50000000
+
+#
+# SQLite limits the number of parameters of a statement
+_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key NOT NULL,
+    value TEXT,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_hits ON entries (hits);
+"""
+
+
+def _is_cacheable(value):
+    """
+    Only strings, bytes and integers that SQLite stores as they are
+    (booleans and floats would compare equal to integers)
+    """
+    value_type = type(value)
+    return (value_type is str) or (value_type is bytes) or (
+        value_type is int and -(2 ** 63) <= value < 2 ** 63
+    )
+
+
+class PersistentCache(object):
+    """
+    Cache of normalized values for each kind of field ('shipname',
+    'callsign' or 'owner') in a SQLite file, shared by runs and processes.
+
+    The file is in WAL mode, so any number of processes can read it while
+    one of them writes. When the number of entries goes over maxsize, the
+    least used entries are evicted. Hit counts are kept in memory and
+    written with the next put_many() or flush(). With warm_start, the most
+    used entries are loaded in memory when the cache is opened.
+
+        with PersistentCache("names.sqlite", warm_start=1000000) as cache:
+            df["shipname_norm"] = cache.normalize(df.shipname, "shipname")
+    """
+
+    def __init__(
+        self,
+        path,
+        maxsize=DEFAULT_PERSISTENT_MAXSIZE,
+        memory_size=DEFAULT_MAXSIZE,
+        warm_start=0,
+        version=None,
+        timeout=60.0,
+    ):
+        """
+        :param path: String, path of the SQLite file
+        :param maxsize: Integer, maximum number of entries in the file
+        :param memory_size: Integer, maximum number of entries in memory
+        :param warm_start: Integer, number of most used entries to load
+        in memory when opening the cache
+        :param version: String, version of the rules (rules_version() if
+        None). Entries of any other version are removed.
+        :param timeout: Float, seconds to wait for a lock on the file
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.path = str(path)
+        self.maxsize = maxsize
+        self.version = version or rules_version()
+        self.timeout = timeout
+        self.memory = LRUCache(memory_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pending_hits = {}
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._open()
+        if warm_start:
+            self.warm(warm_start)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        state["_lock"] = None
+        state["_pending_hits"] = {}
+        state["memory"] = self.memory.maxsize
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.memory = LRUCache(state["memory"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open(self):
+        """
+        Open a connection in this process, create the tables and remove
+        the entries of other versions of the rules
+        """
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in _SCHEMA.split(";"):
+                connection.execute(statement)
+            row = connection.execute(
+                "SELECT value FROM meta WHERE name = 'version'"
+            ).fetchone()
+            if row is None or row[0] != self.version:
+                connection.execute("DELETE FROM entries")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    [("version", self.version), ("size", 0)],
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            connection.close()
+            raise
+        self._connection = connection
+        self._pid = os.getpid()
+
+    def _get_connection(self):
+        #
+        # SQLite connections cannot be shared with forked processes
+        if self._pid != os.getpid():
+            self._open()
+        return self._connection
+
+    def get_many(self, kind, values):
+        """
+        Look up many values at once
+
+        :param kind: String, 'shipname', 'callsign' or 'owner'
+        :param values: Iterable of original values
+        :return: Dict of the cached values to their normalized values
+        """
+        found = {}
+        missing = []
+        for value in values:
+            if not _is_cacheable(value):
+                continue
+            result = self.memory.get((kind, value), _MISSING)
+            if result is _MISSING:
+                missing.append(value)
+            else:
+                found[value] = result
+
+        with self._lock:
+            connection = self._get_connection()
+            from_file = 0
+            for i in range(0, len(missing), _BATCH_SIZE):
+                keys = missing[i:i + _BATCH_SIZE]
+                rows = connection.execute(
+                    "SELECT key, value FROM entries WHERE kind = ? "
+                    "AND key IN (%s)" % ", ".join("?" * len(keys)),
+                    [kind] + keys,
+                )
+                for key, result in rows:
+                    found[key] = result
+                    self.memory.put((kind, key), result)
+                    from_file += 1
+
+            for value in found:
+                key = (kind, value)
+                self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+            self.hits += len(found)
+            self.misses += len(missing) - from_file
+        return found
+
+    def put_many(self, kind, items):
+        """
+        Save many normalized values at once, then evict the least used
+        entries if there are more than maxsize
+
+        :param kind: String, 'shipname', 'callsign' or 'owner'
+        :param items: Iterable of (original value, normalized value)
+        """
+        rows = [
+            (kind, value, result)
+            for value, result in items
+            if _is_cacheable(value)
+        ]
+        for _, value, result in rows:
+            self.memory.put((kind, value), result)
+
+        with self._lock:
+            self._write(rows)
+
+    def flush(self):
+        """
+        Write the pending hit counts to the file
+        """
+        with self._lock:
+            self._write([])
+
+    def _write(self, rows):
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self._pending_hits:
+                connection.executemany(
+                    "UPDATE entries SET hits = hits + ? "
+                    "WHERE kind = ? AND key = ?",
+                    [
+                        (hits, kind, value)
+                        for (kind, value), hits in self._pending_hits.items()
+                    ],
+                )
+            if rows:
+                before = connection.total_changes
+                connection.executemany(
+                    "INSERT OR IGNORE INTO entries (kind, key, value) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "UPDATE meta SET value = value + ? WHERE name = 'size'",
+                    (connection.total_changes - before,),
+                )
+                size = connection.execute(
+                    "SELECT value FROM meta WHERE name = 'size'"
+                ).fetchone()[0]
+                if size > self.maxsize:
+                    self._evict(connection, size - self.maxsize)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._pending_hits = {}
+
+    def _evict(self, connection, count):
+        """
+        Remove the count least used entries, the oldest first among
+        entries used as often
+        """
+        connection.execute(
+            "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries "
+            "ORDER BY hits, rowid LIMIT ?)",
+            (count,),
+        )
+        connection.execute(
+            "UPDATE meta SET value = value - ? WHERE name = 'size'", (count,)
+        )
+        self.evictions += count
+
+    def warm(self, count):
+        """
+        Load the count most used entries in memory
+
+        :param count: Integer, number of entries to load
+        :return: Integer, number of entries loaded
+        """
+        with self._lock:
+            rows = self._get_connection().execute(
+                "SELECT kind, key, value FROM entries ORDER BY hits DESC "
+                "LIMIT ?",
+                (min(count, self.memory.maxsize),),
+            ).fetchall()
+        for kind, key, result in reversed(rows):
+            self.memory.put((kind, key), result)
+        return len(rows)
+
+    def normalize(self, values, kind="shipname"):
+        """
+        Normalize values with the list function of the field, looking up
+        the distinct values in the cache first and saving the new ones
+
+        :param values: Iterable of original values
+        :param kind: String, 'shipname', 'callsign' or 'owner'
+        :return: List of normalized values
+        """
+        if kind not in LIST_FUNCTIONS:
+            raise ValueError("Unknown kind of field: %s" % kind)
+        values = list(values)
+
+        distinct = list(dict.fromkeys(v for v in values if _is_cacheable(v)))
+        found = self.get_many(kind, distinct)
+        missing = [v for v in distinct if v not in found]
+        if missing:
+            normalized = LIST_FUNCTIONS[kind](missing)
+            self.put_many(kind, zip(missing, normalized))
+            found.update(zip(missing, normalized))
+
+        others = [i for i, v in enumerate(values) if not _is_cacheable(v)]
+        result = [found.get(v) if _is_cacheable(v) else None for v in values]
+        if others:
+            normalized = LIST_FUNCTIONS[kind]([values[i] for i in others])
+            for i, value in zip(others, normalized):
+                result[i] = value
+        return result
+
+    def __len__(self):
+        with self._lock:
+            return self._get_connection().execute(
+                "SELECT value FROM meta WHERE name = 'size'"
+            ).fetchone()[0]
+
+    def info(self):
+        """
+        :return: CacheInfo, hits and misses of get_many(), evictions,
+        maximum and current number of entries in the file
+        """
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self)
+        )
+
+    def close(self):
+        """
+        Write the pending hit counts and close the file
+        """
+        if self._pid == os.getpid():
+            self.flush()
+            self._connection.close()
+        self._connection = None
+        self._pid = None
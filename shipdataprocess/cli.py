@@ -0,0 +1,380 @@
+"""
+Command line interface of shipdataprocess.
+
+    shipdataprocess normalize --shipname name --callsign callsign data.csv
+
+reads CSV or newline-delimited JSON records from a file or the standard
+input, normalizes the given columns and writes the records to the standard
+output with the normalized values appended as new columns. Records are
+processed in chunks of a bounded size, so memory stays flat whatever
+the size of the input.
+
+    shipdataprocess serve --port 8000
+
+serves the normalization functions over HTTP (see server.py).
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+
+from .batch import normalize_column
+from .cache import PersistentCache
+
+DEFAULT_CHUNKSIZE = 50000
+
+
+class UsageError(Exception):
+    """
+    Arguments that do not make sense, reported with the usage
+    """
+
+
+class DataError(Exception):
+    """
+    Input that cannot be read, reported with the line where it fails
+    """
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _normalize_records(records, columns, suffix, get, cache=None):
+    """
+    Return the normalized values of each column for a chunk of records
+
+    :param records: List, records of the chunk (lists or dicts)
+    :param columns: List of (column, kind) tuples
+    :param suffix: String, appended to the column name for the new column
+    :param get: Function(record, column) returning the original value
+    :param cache: PersistentCache or None
+    :return: List of (new column name, list of normalized values)
+    """
+    normalized = []
+    for column, kind in columns:
+        values = [get(record, column) for record in records]
+        if kind != "shipname":
+            #
+            # Numbers of JSON records are call signs and owners as written
+            values = [
+                x if x is None or isinstance(x, str) else str(x)
+                for x in values
+            ]
+        result = normalize_column(values, kind=kind, cache=cache)
+        normalized.append((column + suffix, result.tolist()))
+    return normalized
+
+
+def _process_csv(
+    infile, outfile, columns, suffix, chunksize, report, cache=None
+):
+    reader = csv.reader(infile)
+    try:
+        _write_csv(reader, outfile, columns, suffix, chunksize, report, cache)
+    except csv.Error as e:
+        raise DataError("Line %d: %s" % (reader.line_num, e))
+    except UnicodeDecodeError as e:
+        raise DataError("After line %d: %s" % (reader.line_num, e))
+
+
+def _write_csv(reader, outfile, columns, suffix, chunksize, report, cache):
+    writer = csv.writer(outfile, lineterminator="\n")
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+
+    missing = [column for column, _ in columns if column not in header]
+    if missing:
+        raise UsageError("Columns not found: %s" % ", ".join(missing))
+    positions = {column: header.index(column) for column, _ in columns}
+    writer.writerow(header + [column + suffix for column, _ in columns])
+
+    def get(record, column):
+        position = positions[column]
+        return record[position] if position < len(record) else None
+
+    for records in _chunks(reader, chunksize):
+        normalized = _normalize_records(
+            records, columns, suffix, get, cache
+        )
+        for i, record in enumerate(records):
+            writer.writerow(
+                record
+                + [
+                    "" if values[i] is None else values[i]
+                    for _, values in normalized
+                ]
+            )
+        report(len(records))
+
+
+def _read_ndjson(infile, columns):
+    """
+    Yield the records of newline-delimited JSON, raising DataError with
+    the line of the first record that cannot be read
+    """
+    number = 0
+    try:
+        for number, line in enumerate(infile, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise DataError("Line %d: invalid JSON: %s" % (number, e))
+            if not isinstance(record, dict):
+                raise DataError("Line %d: not a JSON object" % number)
+            for column, _ in columns:
+                if isinstance(record.get(column), (dict, list)):
+                    raise DataError(
+                        "Line %d: %s is not a string or a number"
+                        % (number, column)
+                    )
+            yield record
+    except UnicodeDecodeError as e:
+        raise DataError("After line %d: %s" % (number, e))
+
+
+def _process_ndjson(
+    infile, outfile, columns, suffix, chunksize, report, cache=None
+):
+    for records in _chunks(_read_ndjson(infile, columns), chunksize):
+        normalized = _normalize_records(
+            records,
+            columns,
+            suffix,
+            lambda record, column: record.get(column),
+            cache,
+        )
+        for i, record in enumerate(records):
+            for name, values in normalized:
+                record[name] = values[i]
+            outfile.write(json.dumps(record, ensure_ascii=False))
+            outfile.write("\n")
+        report(len(records))
+
+
+class ThroughputReport(object):
+    """
+    Count processed rows and print the throughput to a stream
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.rows = 0
+        self.start = time.perf_counter()
+
+    def __call__(self, rows):
+        self.rows += rows
+        if self.stream is not None:
+            self.stream.write(
+                "%d rows, %.0f rows/s\n" % (self.rows, self.rate())
+            )
+            self.stream.flush()
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.start
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+def _open_input(path, encoding):
+    if path == "-":
+        return io.TextIOWrapper(
+            sys.stdin.buffer, encoding=encoding, newline=""
+        )
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def _input_format(args):
+    if args.format:
+        return args.format
+    if args.input.endswith((".json", ".jsonl", ".ndjson")):
+        return "ndjson"
+    return "csv"
+
+
+def normalize_command(args):
+    columns = (
+        [(column, "shipname") for column in args.shipname or []]
+        + [(column, "callsign") for column in args.callsign or []]
+        + [(column, "owner") for column in args.owner or []]
+    )
+    if not columns:
+        raise UsageError(
+            "Give at least one of --shipname, --callsign or --owner"
+        )
+    if len(set(column for column, _ in columns)) < len(columns):
+        raise UsageError("Each column can only be normalized once")
+
+    process = {"csv": _process_csv, "ndjson": _process_ndjson}[
+        _input_format(args)
+    ]
+    report = ThroughputReport(sys.stderr if args.progress else None)
+    cache = PersistentCache(args.cache) if args.cache else None
+    try:
+        with _open_input(args.input, args.encoding) as infile:
+            process(
+                infile,
+                sys.stdout,
+                columns,
+                args.suffix,
+                args.chunksize,
+                report,
+                cache,
+            )
+    finally:
+        if cache is not None:
+            cache.close()
+    sys.stdout.flush()
+
+    if args.progress:
+        sys.stderr.write(
+            "Done: %d rows, %.0f rows/s\n" % (report.rows, report.rate())
+        )
+
+
+def serve_command(args):
+    from .server import serve
+
+    sys.stderr.write(
+        "Serving on http://%s:%d (Ctrl-C to stop)\n" % (args.host, args.port)
+    )
+    serve(
+        args.host,
+        args.port,
+        args.workers,
+        max_batch_size=args.max_batch_size,
+        max_delay=args.max_delay_ms / 1000.0,
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="shipdataprocess",
+        description="Process raw ship data (AIS or vessel registries)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    normalize = subparsers.add_parser(
+        "normalize",
+        help="normalize columns of a CSV or newline-delimited JSON input",
+    )
+    normalize.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="input file, or - for the standard input (default)",
+    )
+    normalize.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        help="input format (default: from the file extension, or csv)",
+    )
+    normalize.add_argument(
+        "--shipname",
+        action="append",
+        metavar="COLUMN",
+        help="column of ship names to normalize (repeatable)",
+    )
+    normalize.add_argument(
+        "--callsign",
+        action="append",
+        metavar="COLUMN",
+        help="column of call signs to normalize (repeatable)",
+    )
+    normalize.add_argument(
+        "--owner",
+        action="append",
+        metavar="COLUMN",
+        help="column of owner names to standardize (repeatable)",
+    )
+    normalize.add_argument(
+        "--suffix",
+        default="_normalized",
+        help="suffix of the new columns (default: _normalized)",
+    )
+    normalize.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="number of records processed at once (default: %(default)s)",
+    )
+    normalize.add_argument(
+        "--encoding", default="utf-8", help="encoding of the input"
+    )
+    normalize.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="SQLite file caching the normalized values across runs",
+    )
+    normalize.add_argument(
+        "--progress",
+        action="store_true",
+        help="print the throughput in rows per second to standard error",
+    )
+    normalize.set_defaults(func=normalize_command)
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="serve the normalization functions over HTTP (JSON)",
+    )
+    serve.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to listen on (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port to listen on (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--workers",
+        type=int,
+        help="number of worker processes (default: number of CPUs), "
+        "0 to run in the server process",
+    )
+    serve.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=1000,
+        help="maximum number of values per batch (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--max-delay-ms",
+        type=float,
+        default=0.0,
+        help="milliseconds to wait for more requests before running a "
+        "batch that is not full (default: %(default)s)",
+    )
+    serve.set_defaults(func=serve_command)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except UsageError as e:
+        parser.error(str(e))
+    except DataError as e:
+        sys.stderr.write("%s: error: %s\n" % (parser.prog, e))
+        return 1
+    except BrokenPipeError:
+        sys.stderr.close()
+    return 0
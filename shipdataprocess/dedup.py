@@ -0,0 +1,323 @@
+"""
+This file provides the detection of near-duplicate ship names over a whole
+registry without comparing every pair of names, for example to deduplicate
+vessels merged from several registries.
+
+Each normalized name is turned into its set of q-grams and summarized by a
+MinHash signature: for each of num_perm hash functions, the smallest hash
+of its q-grams. Two names agree on a component of their signatures with a
+probability equal to the Jaccard similarity of their q-gram sets. The
+signatures are cut into bands, and names that agree on a whole band fall
+in the same bucket and become a candidate pair (locality sensitive
+hashing). Candidate pairs are kept if the share of components their
+signatures agree on, an estimate of their Jaccard similarity, reaches the
+threshold. Names can also be blocked on another column, such as the flag
+or the call sign, so that only names of the same block are paired.
+
+Everything is computed with NumPy over all names at once, and the number
+of candidates grows with the number of names that are actually similar
+rather than with the square of the number of names.
+
+    pairs = near_duplicate_shipnames(registry.shipname, blocks=registry.flag)
+"""
+
+import numpy as np
+import pandas as pd
+
+from .batch import normalize_column
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.5
+
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(32)
+
+
+def _qgram_hashes(names, q):
+    """
+    Return the 32-bit hashes of the q-grams of each name, and the number of
+    q-grams of each name. Names shorter than q are a single q-gram.
+    """
+    encoded = [name.encode("utf-8") for name in names]
+    lengths = np.array([len(name) for name in encoded], dtype=np.int64)
+    starts = np.zeros(len(encoded), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    ends = starts + lengths
+    buffer = np.frombuffer(b"".join(encoded) + b"\0" * q, dtype=np.uint8)
+
+    counts = np.where(lengths > 0, np.maximum(lengths - q + 1, 1), 0)
+    owners = np.repeat(np.arange(len(encoded)), counts)
+    positions = (
+        np.arange(counts.sum())
+        - np.repeat(np.cumsum(counts) - counts, counts)
+        + starts[owners]
+    )
+
+    #
+    # Pack the bytes of each q-gram (those before the end of its name) in
+    # an integer, then mix it to spread the bits (for q > 8, the first bytes
+    # are shifted out, which only makes q-grams collide a little more)
+    grams = np.zeros(len(positions), dtype=np.uint64)
+    owner_ends = ends[owners]
+    for j in range(q):
+        byte = np.where(positions + j < owner_ends, buffer[positions + j], 0)
+        grams = (grams << np.uint64(8)) | byte.astype(np.uint64)
+    hashes = ((grams + np.uint64(1)) * _MIX) >> _SHIFT
+    return hashes, counts
+
+
+def minhash_signatures(names, num_perm=DEFAULT_NUM_PERM, q=2, seed=1):
+    """
+    Return the MinHash signatures of the q-gram sets of names
+
+    :param names: List of strings, normalized names. Nulls and empty names
+    get a signature of 0xFFFFFFFF that matches nothing.
+    :param num_perm: Integer, number of hash functions
+    :param q: Integer, length of the q-grams
+    :param seed: Integer, seed of the hash functions
+    :return: NumPy array of uint32 of shape (len(names), num_perm)
+    """
+    names = [name if isinstance(name, str) else "" for name in names]
+    signatures = np.full((len(names), num_perm), _MAX_HASH, dtype=np.uint32)
+    hashes, counts = _qgram_hashes(names, q)
+    if not len(hashes):
+        return signatures
+
+    #
+    # Multiply-shift hash functions, and the minimum over the q-grams of
+    # each name, which are contiguous in hashes
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | 1
+    increments = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    has_grams = counts > 0
+    starts = (np.cumsum(counts) - counts)[has_grams]
+    for i in range(num_perm):
+        permuted = (hashes * multipliers[i] + increments[i]) >> _SHIFT
+        signatures[has_grams, i] = np.minimum.reduceat(
+            permuted.astype(np.uint32), starts
+        )
+    return signatures
+
+
+def _pairs_in_groups(order, keys):
+    """
+    Return all the pairs of the items of order whose sorted keys are equal
+    """
+    group_start = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    group_size = np.diff(np.r_[group_start, len(keys)])
+    sizes = np.repeat(group_size, group_size)
+    ranks = np.arange(len(keys)) - np.repeat(group_start, group_size)
+
+    #
+    # Each item pairs with the items after it in its group
+    counts = sizes - ranks - 1
+    total = counts.sum()
+    first = np.repeat(np.arange(len(keys)), counts)
+    second = (
+        first
+        + 1
+        + np.arange(total)
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    return order[first], order[second]
+
+
+def _band_pairs(signatures, bands, blocks):
+    """
+    Yield, for each band, the pairs of rows of signatures equal on the
+    band (and in the same block), with left < right
+    """
+    num_perm = signatures.shape[1]
+    if num_perm % bands:
+        raise ValueError(
+            "The number of bands must divide the signature length"
+        )
+    rows = num_perm // bands
+    valid = signatures[:, 0] != _MAX_HASH
+    if blocks is not None:
+        blocks = np.asarray(blocks, dtype=np.int64)
+        valid &= blocks >= 0
+    candidates = np.flatnonzero(valid)
+
+    for band in range(bands):
+        #
+        # Hash the rows of the band (and the block) in a 64-bit key
+        band_values = signatures[candidates, band * rows:(band + 1) * rows]
+        keys = np.zeros(len(candidates), dtype=np.uint64)
+        if blocks is not None:
+            keys = blocks[candidates].astype(np.uint64)
+        for j in range(rows):
+            keys = (keys ^ band_values[:, j].astype(np.uint64)) * _MIX
+        order = np.argsort(keys, kind="stable")
+        yield _pairs_in_groups(candidates[order], keys[order])
+
+
+def _unique_pairs(lefts, rights, n):
+    pairs = np.unique(
+        np.concatenate(lefts).astype(np.int64) * n + np.concatenate(rights)
+    )
+    return pairs // n, pairs % n
+
+
+def lsh_candidate_pairs(signatures, bands=DEFAULT_BANDS, blocks=None):
+    """
+    Return the pairs of rows of signatures that are equal on at least one
+    band of their signatures (and in the same block)
+
+    :param signatures: NumPy array of shape (n, num_perm), from
+    minhash_signatures()
+    :param bands: Integer, number of bands, dividing num_perm
+    :param blocks: Array of n integer codes of the blocks, rows with a
+    negative code are never paired
+    :return: Tuple of two NumPy arrays of row numbers, with left < right
+    """
+    lefts = [np.empty(0, dtype=np.int64)]
+    rights = [np.empty(0, dtype=np.int64)]
+    for left, right in _band_pairs(signatures, bands, blocks):
+        lefts.append(left)
+        rights.append(right)
+    return _unique_pairs(lefts, rights, len(signatures))
+
+
+def _similar_pairs(signatures, bands, blocks, threshold):
+    """
+    Return the candidate pairs of lsh_candidate_pairs() that agree on at
+    least threshold of their signatures, and the share they agree on.
+    Candidates are filtered band by band so that only the similar pairs
+    are kept in memory.
+    """
+    num_perm = signatures.shape[1]
+    step = max(1, 4000000 // num_perm)
+    lefts = [np.empty(0, dtype=np.int64)]
+    rights = [np.empty(0, dtype=np.int64)]
+    for left, right in _band_pairs(signatures, bands, blocks):
+        for start in range(0, len(left), step):
+            chunk_left = left[start:start + step]
+            chunk_right = right[start:start + step]
+            agree = np.count_nonzero(
+                signatures[chunk_left] == signatures[chunk_right], axis=1
+            )
+            keep = agree >= threshold * num_perm
+            lefts.append(chunk_left[keep])
+            rights.append(chunk_right[keep])
+    left, right = _unique_pairs(lefts, rights, len(signatures))
+    agree = np.count_nonzero(signatures[left] == signatures[right], axis=1)
+    return left, right, agree / num_perm
+
+
+def _cross_pairs(members, starts, sizes, left_groups, right_groups):
+    """
+    Return all the pairs of a member of a left group and a member of the
+    matching right group, members of group g being
+    members[starts[g]:starts[g] + sizes[g]]
+    """
+    left_sizes = sizes[left_groups]
+    right_sizes = sizes[right_groups]
+    counts = left_sizes * right_sizes
+    ranks = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    right_sizes = np.repeat(right_sizes, counts)
+    left = np.repeat(starts[left_groups], counts) + ranks // right_sizes
+    right = np.repeat(starts[right_groups], counts) + ranks % right_sizes
+    return members[left], members[right]
+
+
+def near_duplicates(
+    names,
+    threshold=DEFAULT_THRESHOLD,
+    blocks=None,
+    num_perm=DEFAULT_NUM_PERM,
+    bands=DEFAULT_BANDS,
+    q=2,
+    seed=1,
+):
+    """
+    Find the pairs of near-duplicate names. With the default 16 bands of 4
+    hashes, pairs with a Jaccard similarity of 0.5 are found with a
+    probability of 0.64, and pairs with 0.7 with a probability of 0.99.
+    Rows with the same name (and block) are all paired with a similarity
+    of 1.
+
+    :param names: Pandas Series, List or Array of normalized names
+    :param threshold: Float, minimum estimated Jaccard similarity
+    :param blocks: Pandas Series, List or Array of the same length, only
+    pair names with the same (non-null) value, such as the flag
+    :param num_perm: Integer, number of hash functions
+    :param bands: Integer, number of bands, dividing num_perm
+    :param q: Integer, length of the q-grams
+    :param seed: Integer, seed of the hash functions
+    :return: Pandas DataFrame with the positions of the names of each pair
+    in columns left and right (left < right), and their estimated Jaccard
+    similarity in column similarity, sorted by left and right
+    """
+    names = pd.Series(names, dtype=object)
+    name_codes, uniques = pd.factorize(
+        names.where(names.map(lambda x: isinstance(x, str) and x != ""))
+    )
+    if blocks is None:
+        block_codes = np.zeros(len(names), dtype=np.int64)
+    else:
+        block_codes = pd.factorize(pd.Series(blocks, dtype=object))[0]
+
+    #
+    # Signatures and candidate pairs are computed once for each distinct
+    # name of each block, then pairs of groups are expanded to their rows
+    rows = np.flatnonzero((name_codes >= 0) & (block_codes >= 0))
+    block_count = block_codes.max(initial=0) + 1
+    group_codes, group_keys = pd.factorize(
+        name_codes[rows] * block_count + block_codes[rows]
+    )
+    group_keys = np.asarray(group_keys, dtype=np.int64)
+    group_names = group_keys // block_count
+    group_blocks = group_keys % block_count
+
+    signatures = minhash_signatures(list(uniques), num_perm, q, seed)
+    signatures = signatures[group_names]
+    left_groups, right_groups, similarity = _similar_pairs(
+        signatures, bands, group_blocks, threshold
+    )
+
+    order = np.argsort(group_codes, kind="stable")
+    members = rows[order]
+    sizes = np.bincount(group_codes, minlength=len(group_keys))
+    starts = np.cumsum(sizes) - sizes
+    pairs = [
+        _cross_pairs(members, starts, sizes, left_groups, right_groups),
+        _pairs_in_groups(members, group_codes[order]),
+    ]
+    similarity = np.concatenate(
+        [
+            np.repeat(
+                similarity, sizes[left_groups] * sizes[right_groups]
+            ),
+            np.ones(len(pairs[1][0])),
+        ]
+    )
+    left = np.concatenate([pairs[0][0], pairs[1][0]])
+    right = np.concatenate([pairs[0][1], pairs[1][1]])
+    left, right = np.minimum(left, right), np.maximum(left, right)
+    order = np.lexsort((right, left))
+    return pd.DataFrame(
+        {
+            "left": left[order],
+            "right": right[order],
+            "similarity": similarity[order],
+        }
+    )
+
+
+def near_duplicate_shipnames(
+    shipnames, threshold=DEFAULT_THRESHOLD, blocks=None, **kwargs
+):
+    """
+    Normalize ship names with normalize_shipname() and find the pairs of
+    near-duplicate normalized names with near_duplicates()
+
+    :param shipnames: Pandas Series, List or Array of original vessel names
+    :return: Pandas DataFrame, see near_duplicates()
+    """
+    normalized = normalize_column(shipnames, kind="shipname")
+    return near_duplicates(normalized.tolist(), threshold, blocks, **kwargs)
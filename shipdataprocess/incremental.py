@@ -0,0 +1,253 @@
+"""
+This file provides incremental normalization of snapshots of a registry.
+Snapshots change little from one day to the next, so instead of running
+every normalization and standardization function on every row, the
+results of the previous run are kept in a manifest file: for each row
+key, a hash of the raw input fields and the outputs. A new snapshot only
+goes through the functions for the rows that are new or whose input
+fields changed; the other rows take their outputs from the manifest.
+
+The manifest is tied to the version of the rules (see rules_version())
+and to the fields to compute, so that changing either recomputes
+everything.
+
+    normalizer = IncrementalNormalizer(
+        "registry.manifest",
+        key="vessel_id",
+        fields={
+            "shipname_norm": ("shipname", "shipname"),
+            "imo_std": ("imo", "imo"),
+        },
+    )
+    df = df.join(normalizer.run(df))
+"""
+
+from collections import namedtuple
+import hashlib
+import os
+import pickle
+import types
+
+import numpy as np
+import pandas as pd
+
+from .batch import normalize_column
+from .cache import rules_version
+from .standardize import (
+    standardize_float,
+    standardize_imo,
+    standardize_int_str,
+    standardize_str,
+    standardize_time,
+)
+
+COLUMN_FUNCTIONS = {
+    "shipname": lambda values: normalize_column(values, kind="shipname"),
+    "callsign": lambda values: normalize_column(values, kind="callsign"),
+    "owner": lambda values: normalize_column(values, kind="owner"),
+    "imo": standardize_imo,
+    "float": standardize_float,
+    "int_str": standardize_int_str,
+    "str": standardize_str,
+    "time": standardize_time,
+}
+
+RunStats = namedtuple(
+    "RunStats", ["rows", "new", "changed", "unchanged", "removed"]
+)
+
+
+def _update_code_digest(digest, code):
+    """
+    Add the bytecode, constants and names of a code object to a digest,
+    and those of the functions defined in it
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_digest(digest, const)
+        elif isinstance(const, frozenset):
+            #
+            # The order of sets changes with the hash seed
+            digest.update(repr(sorted(const, key=repr)).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _function_name(kind):
+    """
+    Return the name of a kind of field for the signature of the manifest:
+    the kind itself, or the name of a function with a hash of its code, so
+    that changing a lambda or redefining a function changes the signature
+    """
+    if not callable(kind):
+        return kind
+    function = kind
+    if not hasattr(function, "__qualname__"):
+        function = type(function)
+    name = "%s.%s" % (function.__module__, function.__qualname__)
+    code = getattr(kind, "__code__", None)
+    if code is None:
+        code = getattr(getattr(function, "__call__", None), "__code__", None)
+    if code is not None:
+        digest = hashlib.sha256()
+        _update_code_digest(digest, code)
+        name += ":" + digest.hexdigest()[:16]
+    return name
+
+
+def _hash_rows(frame):
+    """
+    Return a 64-bit hash of the values of each row of frame. Values of
+    different types hash differently even if they print the same (1 and
+    '1'), as they may not be normalized the same way.
+    """
+    columns = {}
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        if values.dtype == object:
+            others = ~np.fromiter(
+                (type(x) is str for x in values), dtype=bool, count=len(values)
+            )
+            if others.any():
+                values = values.copy()
+                values[others] = [
+                    "\0%s%r" % (type(x).__name__, x) for x in values[others]
+                ]
+        columns[column] = values
+    return pd.util.hash_pandas_object(
+        pd.DataFrame(columns), index=False, categorize=False
+    ).to_numpy()
+
+
+class IncrementalNormalizer(object):
+    """
+    Compute output fields of successive snapshots of a table, recomputing
+    only the rows that are new or changed since the last run
+    """
+
+    def __init__(self, path, key, fields, version=None):
+        """
+        :param path: String, path of the manifest file, created by the
+        first run
+        :param key: String or List of strings, column(s) identifying a row
+        from one snapshot to the next
+        :param fields: Dict of output column name to (input column, kind),
+        where kind is a key of COLUMN_FUNCTIONS or a function taking a
+        Pandas Series and returning the values for each of its rows. The
+        code of functions is part of the signature of the manifest, but
+        not the values they read outside of it (give a new version when
+        those change).
+        :param version: String, version of the rules (rules_version() if
+        None)
+        """
+        for column, kind in fields.values():
+            if not callable(kind) and kind not in COLUMN_FUNCTIONS:
+                raise ValueError("Unknown kind of field: %s" % kind)
+        self.path = str(path)
+        self.keys = [key] if isinstance(key, str) else list(key)
+        self.fields = dict(fields)
+        self.inputs = sorted({column for column, _ in self.fields.values()})
+        self.version = version or rules_version()
+        self.signature = (
+            self.version,
+            tuple(self.keys),
+            tuple(
+                (output, column, _function_name(kind))
+                for output, (column, kind) in sorted(self.fields.items())
+            ),
+        )
+        self.stats = None
+
+    def _row_keys(self, frame):
+        if len(self.keys) == 1:
+            return pd.Index(frame[self.keys[0]])
+        return pd.MultiIndex.from_frame(frame[self.keys])
+
+    def load(self):
+        """
+        Return the manifest of the last run, or None if there is no
+        manifest or it was made with other rules or fields
+
+        :return: Pandas DataFrame with the key columns, the hash of the
+        inputs in column _hash and the output columns, or None
+        """
+        try:
+            with open(self.path, "rb") as f:
+                signature, manifest = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        if signature != self.signature:
+            return None
+        return manifest
+
+    def save(self, manifest):
+        """
+        Replace the manifest file, atomically
+        """
+        temporary = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(temporary, "wb") as f:
+            pickle.dump(
+                (self.signature, manifest),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporary, self.path)
+
+    def run(self, frame):
+        """
+        Compute the output fields of a snapshot and update the manifest
+
+        :param frame: Pandas DataFrame with the key and input columns
+        :return: Pandas DataFrame with the output columns, with the index
+        of frame
+        """
+        row_keys = self._row_keys(frame)
+        if row_keys.has_duplicates:
+            raise ValueError("Row keys must be unique")
+        hashes = _hash_rows(frame[self.inputs])
+
+        manifest = self.load()
+        if manifest is None:
+            positions = np.full(len(frame), -1, dtype=np.int64)
+            previous = 0
+        else:
+            positions = self._row_keys(manifest).get_indexer(row_keys)
+            previous = len(manifest)
+        known = positions >= 0
+        unchanged = known.copy()
+        if known.any():
+            unchanged[known] = (
+                manifest["_hash"].to_numpy()[positions[known]]
+                == hashes[known]
+            )
+        fresh = ~unchanged
+
+        outputs = {}
+        for output, (column, kind) in self.fields.items():
+            values = np.empty(len(frame), dtype=object)
+            if unchanged.any():
+                values[unchanged] = manifest[output].to_numpy()[
+                    positions[unchanged]
+                ]
+            if fresh.any():
+                function = kind if callable(kind) else COLUMN_FUNCTIONS[kind]
+                result = function(frame[column][fresh])
+                values[fresh] = list(result)
+            outputs[output] = values
+
+        new_manifest = frame[self.keys].reset_index(drop=True)
+        new_manifest["_hash"] = hashes
+        for output, values in outputs.items():
+            new_manifest[output] = pd.Series(values, dtype=object)
+        self.save(new_manifest)
+
+        self.stats = RunStats(
+            rows=len(frame),
+            new=int((~known).sum()),
+            changed=int((known & fresh).sum()),
+            unchanged=int(unchanged.sum()),
+            removed=previous - int(known.sum()),
+        )
+        return pd.DataFrame(outputs, index=frame.index, dtype=object)
@@ -0,0 +1,263 @@
+"""
+This file provides ShipNameIndex, an index of normalized ship names that
+finds the names within a given edit (Levenshtein) distance of a query, or
+its nearest names, without comparing the query to every name.
+
+Names are indexed by their characters and bigrams (numbered by
+occurrence, so that repeated ones count as many times as they appear). A
+name within distance k of a query has a length within k of the query's
+and shares at least len(query) - 1 - 2 * k bigrams with it, and at least
+len(query) - k characters. Only the names that pass the length filter and
+the tighter of the other two, counted with NumPy over the posting lists
+of the query, are compared to the query.
+
+    index = ShipNameIndex.from_shipnames(registry.shipname)
+    index.within("OCEANSTAR2", 1)   # [('OCEANSTAR2', 0), ('OCEANSTAR3', 1)]
+    index.nearest("OCEANSTR2", 3)
+"""
+
+import pickle
+
+import numpy as np
+
+from .batch import normalize_shipname_list
+
+
+def levenshtein(a, b):
+    """
+    Return the edit distance between two strings, with the bit-parallel
+    algorithm of Myers (as formulated by Hyyrö)
+
+    :param a: String
+    :param b: String
+    :return: Integer, minimum number of insertions, deletions and
+    substitutions of single characters turning a into b
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    return _distance(_pattern(b), len(b), a)
+
+
+def _pattern(text):
+    """
+    Return the bit mask of the positions of each character in text
+    """
+    peq = {}
+    for i, char in enumerate(text):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq
+
+
+def _distance(peq, m, text):
+    """
+    Return the edit distance between the pattern of length m described
+    by peq (see _pattern()) and text
+    """
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = mask
+    mv = 0
+    score = m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def _grams(name, q=2):
+    """
+    Return the q-grams of name (bigrams by default), numbered by
+    occurrence
+    """
+    seen = {}
+    grams = []
+    for i in range(len(name) - q + 1):
+        gram = name[i:i + q]
+        count = seen.get(gram, 0)
+        seen[gram] = count + 1
+        grams.append((gram, count))
+    return grams
+
+
+class ShipNameIndex(object):
+    """
+    Index of distinct (normalized) ship names for edit distance queries.
+    Indexes are picklable, and can be saved and loaded with save() and
+    load() so that they are built once and shared by workers.
+
+    Queries shorter than 2 * k + 2 characters only filter the names by
+    their characters, which most names of a similar length share at k = 3
+    and above: such queries are compared to a large part of the names of
+    their length band. On 65k distinct names, a query takes about 1.5 ms
+    at k = 1, 8 ms at k = 2 and 16 ms at k = 3, more on larger indexes.
+    """
+
+    def __init__(self, names):
+        """
+        :param names: Iterable of strings, normalized ship names. Nulls
+        and duplicates are ignored.
+        """
+        names = {name for name in names if isinstance(name, str)}
+        #
+        # Names are numbered by length, so that the names of a range of
+        # lengths are a range of numbers
+        self.names = sorted(names, key=lambda name: (len(name), name))
+        self.lengths = np.array([len(name) for name in self.names])
+        self.offsets = np.searchsorted(
+            self.lengths, np.arange(self.lengths.max(initial=0) + 2)
+        )
+
+        postings = {}
+        for i, name in enumerate(self.names):
+            for gram in _grams(name, 1) + _grams(name, 2):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {
+            gram: np.array(ids, dtype=np.int32)
+            for gram, ids in postings.items()
+        }
+
+    @classmethod
+    def from_shipnames(cls, names):
+        """
+        Build an index of original ship names once normalized
+
+        :param names: Iterable of original vessel names
+        :return: ShipNameIndex
+        """
+        return cls(normalize_shipname_list(list(names)))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return self.within(name, 0) != []
+
+    def _length_range(self, length, k):
+        """
+        Return the range of numbers of the names of length within k
+        """
+        top = len(self.offsets) - 1
+        low = self.offsets[min(max(length - k, 0), top)]
+        high = self.offsets[min(max(length + k + 1, 0), top)]
+        return low, high
+
+    def _candidates(self, query, k):
+        """
+        Return the numbers of the names that may be within k of the query:
+        names of a length within k that share enough bigrams with it, or
+        enough characters when k is too large for the bigrams to tell
+        """
+        low, high = self._length_range(len(query), k)
+        grams = _grams(query, 2)
+        threshold = len(grams) - 2 * k
+        if threshold <= 0:
+            #
+            # An edit changes at most one character of the query
+            grams = _grams(query, 1)
+            threshold = len(grams) - k
+        if threshold <= 0 or low == high:
+            #
+            # Too short a query to share anything for sure
+            return np.arange(low, high)
+
+        #
+        # Names are numbered by length, so the names of the right lengths
+        # are a slice of each (sorted) posting list
+        postings = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is not None:
+                start, end = np.searchsorted(ids, (low, high))
+                postings.append(ids[start:end])
+        if len(postings) < threshold:
+            return np.empty(0, dtype=np.int64)
+
+        counts = np.bincount(
+            np.concatenate(postings) - low, minlength=high - low
+        )
+        return np.flatnonzero(counts >= threshold) + low
+
+    def within(self, query, k=1):
+        """
+        Return the names within edit distance k of the query
+
+        :param query: String, a normalized ship name
+        :param k: Integer, maximum edit distance
+        :return: List of (name, distance) sorted by distance, then name
+        """
+        if not query:
+            low, high = self._length_range(0, k)
+            return [(name, len(name)) for name in self.names[low:high]]
+
+        peq = _pattern(query)
+        m = len(query)
+        names = self.names
+        results = []
+        for i in self._candidates(query, k).tolist():
+            distance = _distance(peq, m, names[i])
+            if distance <= k:
+                results.append((names[i], distance))
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results
+
+    def nearest(self, query, n=1, max_distance=3):
+        """
+        Return the n names nearest to the query, looking no further than
+        max_distance
+
+        :param query: String, a normalized ship name
+        :param n: Integer, number of names
+        :param max_distance: Integer, maximum edit distance
+        :return: List of at most n (name, distance) sorted by distance,
+        then name
+        """
+        results = []
+        for k in range(max_distance + 1):
+            results = self.within(query, k)
+            if len(results) >= n:
+                break
+        return results[:n]
+
+    def within_many(self, queries, k=1):
+        """
+        :param queries: Iterable of normalized ship names
+        :return: List of the results of within() for each query
+        """
+        return [self.within(query, k) for query in queries]
+
+    def nearest_many(self, queries, n=1, max_distance=3):
+        """
+        :param queries: Iterable of normalized ship names
+        :return: List of the results of nearest() for each query
+        """
+        return [self.nearest(query, n, max_distance) for query in queries]
+
+    def save(self, path):
+        """
+        Save the index to a file
+        """
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        """
+        Load an index saved with save()
+
+        :return: ShipNameIndex
+        """
+        with open(path, "rb") as f:
+            return pickle.load(f)
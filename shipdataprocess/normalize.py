@@ -5,205 +5,564 @@ standardization of string, will ensure that the strings are comparable to other
 strings despite various ways of recording names of the same vessel.
 It also removes all non-essential characters or white spaces.
 """
-from unidecode import unidecode
-import roman
+from collections import namedtuple
+from contextlib import contextmanager
+import contextvars
 import re
 
+import roman
 
-def normalize_shipname(name):
+from .transliterate import transliterate
+
+
+class Rule(object):
+    """
+    A single precompiled substitution rule of the ship name normalization.
+    Rules carry cheap prefilters (required first characters and substrings)
+    so that the regular expression only runs when it can possibly match.
     """
-    Return a normalized ship name by removing all non-essential characters,
-    prefix, and suffix, and standardizing roman numerals or other parts
-    of the vessel name.
 
-    :param name: String, an original vessel name
-    :return: String, a normalized vessel name
+    __slots__ = ("name", "source", "pattern", "repl", "first", "needles")
+
+    def __init__(self, name, source, repl=" ", first=None, needles=()):
+        self.name = name
+        self.source = source
+        self.pattern = re.compile(source)
+        self.repl = repl
+        self.first = first
+        self.needles = needles
+
+    def could_match(self, text):
+        """
+        Return False only if the rule cannot match the given text
+        """
+        if self.first is not None and text[:1] not in self.first:
+            return False
+        for needle in self.needles:
+            if needle not in text:
+                return False
+        return True
+
+    def __repr__(self):
+        return "Rule(%r, %r)" % (self.name, self.source)
+
+
+#
+# Prefix rules in the order they are applied. They remove vessel type codes
+# such as F/V, M/V, R/V in front of (or behind) the vessel name.
+SHIPNAME_PREFIX_RULES = (
+    # fishing vessel code in English
+    Rule("MFV", r"MFV[^\w]+", needles=("MFV",)),
+    Rule("MPV", r"MPV[^\w]+", needles=("MPV",)),
+    Rule("HMS", r"HMS[^\w]+", needles=("HMS",)),
+    # LPG/LNG variations
+    Rule("LPG_LNG", r"LPG[/|C]*[\W]*|LNG[/|C]*[\W]*", needles=("L",)),
+    # fishing vessel code in English (F/V, F-V, F.V, FV: etc)
+    Rule("FV", r"(\s|^)F[^\w\s]*V[^\w]*", needles=("F", "V")),
+    # fishing vessel code in English
+    Rule("FB_START", r"^F[^\w\s]*B[^\w]+", first="F"),
+    Rule("FB", r" F[^\w\s]*B[^\w]*(\s|$)", needles=(" F",)),
+    # fishing vessel code in Italy/Spain
+    Rule("MP_START", r"^M[^\w\s]*P[^\w]+", first="M"),
+    Rule("MP", r" M[^\w\s]*P[^\w]*(\s|$)", needles=(" M",)),
+    Rule("MB_START", r"^M[^\w\s]*B[^\w]+", first="M"),
+    Rule("MB", r" M[^\w\s]*B[^\w]*(\s|$)", needles=(" M",)),
+    # mostly in UK
+    Rule("GV_START", r"^G[^\w\s]*V[^\w]+", first="G"),
+    Rule("SFGV", r"S+F+[^\w]+G[^\w\s]*V[^\w]*", needles=("SF",)),
+    Rule("GV", r" G[^\w\s]*V[^\w]*(\s|$)", needles=(" G",)),
+    # in English
+    Rule("MV_START", r"^M[^\w\s]*V[^\w]+", first="M"),
+    Rule("MV", r" M[^\w\s]*V[^\w]*(\s|$)", needles=(" M",)),
+    # Merchant Ship
+    Rule("MS_START", r"^M[^\w\s]+S[^\w]+", first="M"),
+    Rule("MS", r" M[^\w\s]+S[^\w]*(\s|$)", needles=(" M",)),
+    # mostly in northern europe
+    Rule("MK_START", r"^M[^\w\s]*K[^\w]+", first="M"),
+    Rule("MK", r" M[^\w\s]+K[^\w]*(\s|$)", needles=(" M",)),
+    # Research Vessel
+    Rule("RV_START", r"^R[^\w\s]*V[^\w]+", first="R"),
+    Rule("RV", r" R[^\w\s]*V[^\w]*(\s|$)", needles=(" R",)),
+    # Tender To
+    Rule("TT_START", r"^T[^\w\s]*T[^\w]+", first="T"),
+    Rule("TT", r" T[^\w\s]*T[^\w]*($)", needles=(" T",)),
+    # Steam Yacht
+    Rule("SY_START", r"^S[^\w\s]*Y[^\w]+", first="S"),
+    Rule("SY", r" S[^\w\s]*Y[^\w]*($)", needles=(" S",)),
+    # Motor Ferry
+    Rule("MF_START", r"^M[^\w\s]*F[^\w]+", first="M"),
+    Rule("MF", r" M[^\w\s]*F[^\w]*($)", needles=(" M",)),
+    # Steam Ship
+    Rule("SS_START", r"^S[^\w\s]*S[^\w]+", first="S"),
+    Rule("SS", r" S[^\w\s]*S[^\w]*($)", needles=(" S",)),
+    # Sailing Vessel
+    Rule("SV_START", r"^S[^\w\s]*V[^\w]+", first="S"),
+    Rule("SV", r" S[^\w\s]*V[^\w]*($)", needles=(" S",)),
+    # Motor Tanker
+    Rule("MT_START", r"^M[^\w\s]*T[^\w]+", first="M"),
+    Rule("MT", r" M[^\w\s]*T[^\w]*($)", needles=(" M",)),
+    # Motor Yacht
+    Rule("MY_START", r"^M[^\w\s]+Y[^\w]+", first="M"),
+    Rule("MY", r" M[^\w\s]+Y[^\w]*($)", needles=(" M",)),
+    # All other types of X/X
+    Rule("X/X_START", r"^[A-Z]/[A-Z][^\w]+", needles=("/",)),
+    Rule("X/X", r" [A-Z]/[A-Z]($)", needles=(" ", "/")),
+    # All other types of X\X
+    Rule("X\\X_START", r"^[A-Z]\\\\[A-Z][^\w]+", needles=("\\\\",)),
+    Rule("X\\X", r" [A-Z]\\\\[A-Z]($)", needles=(" ", "\\\\")),
+    # Indonesia K.M
+    Rule("KM_START", r"^KM[^\w]+", first="K"),
+    # Dutch E.B. equivalent to NO.
+    Rule("EB_START", r"^E.B. ", first="E"),
+)
+
+#
+# All additional information in parentheses or brackets
+SHIPNAME_PARENTHESES_RULES = (
+    Rule("PARENTHESES", r"\(.+\)", needles=("(", ")")),
+    Rule("BRACKETS", r"\[.+\]", needles=("[", "]")),
+)
+
+#
+# Numbers in letters (English, Spanish, French) at the end of the name
+SHIPNAME_NUMBER_WORDS = (
+    ("1", ("ONE", "UNO", "UN")),
+    ("2", ("TWO", "DOS", "DEUX")),
+    ("3", ("THREE", "TRES", "TROIS")),
+    ("4", ("FOUR", "CUATRO", "QUATRE")),
+    ("5", ("FIVE", "CINCO", "CINQ")),
+    ("6", ("SIX", "SEIS")),
+    ("7", ("SEVEN", "SIETE", "SEPT")),
+    ("8", ("EIGHT", "OCHO", "HUIT")),
+    ("9", ("NINE", "NUEVE", "NEUF")),
+    ("10", ("TEN", "DIEZ", "DIX")),
+    ("11", ("ELEVEN", "ONCE", "ONZE")),
+    ("12", ("TWELVE", "DOCE", "DOUZE")),
+    ("13", ("THIRTEEN", "TRECE", "TREIZE")),
+    ("14", ("FOURTEEN", "CATORCE", "QUATORZE")),
+    ("15", ("FIFTEEN", "QUINCE", "QUINZE")),
+)
+
+#
+# Ordinal numbers followed by a space
+SHIPNAME_ORDINALS = (
+    ("1ST ", "FIRST "),
+    ("2ND ", "SECOND "),
+    ("3RD ", "THIRD "),
+    ("4TH ", "FOURTH "),
+    ("5TH ", "FIFTH "),
+)
+
+#
+# Remove NO.s such in NO.5, NO5, NO:5, NO. 5, NO 5, N5, N-5 etc,
+# replace 'BLACK & WHITE' to 'BLACK AND WHITE' and STA and STA. to SANTA
+SHIPNAME_INFIX_RULES = (
+    Rule("NO_DIGITS", r"NO[^\w\s]*[\s]*(?=\d+)", "", needles=("NO",)),
+    Rule("N_DIGITS", r"[\s]+N[\W_0]*(?=\d+)", "", needles=(" N",)),
+    Rule("NO_DOT", r"NO\.\s*(?=[^0-9]+)", "", needles=("NO.",)),
+    Rule("AMPERSAND", r"(?<=[A-Z])\s+&\s+(?=[A-Z])", " AND ", needles=("&",)),
+    Rule(
+        "SANTA",
+        r"(^(STA\s|STA\.)|\s(STA\s|STA\.)|\s(STA|STA\.)$)",
+        "SANTA",
+        needles=("STA",),
+    ),
+)
+
+#
+# Roman numerals that may be deromanized at the end of a ship name.
+# Names whose last word contains L, C, D, M or N are never deromanized,
+# which leaves the numerals made of I, V and X only (1 to 39).
+SHIPNAME_ROMAN_NUMERALS = tuple(
+    (roman.toRoman(n), str(n)) for n in range(1, 40)
+)
+
+#
+# Every prefix rule needs one of these triggers to match, either at the
+# start of the name or anywhere in it, and so does every infix rule and
+# number rule. Triggers may match more names than the rules do, but a name
+# without any trigger of a group is never changed by that group.
+_VESSEL_CODE = (
+    r"(?:F[^\w\s]*[VB]|M[^\w\s]*[PBVSKFTY]|G[^\w\s]*V|R[^\w\s]*V"
+    r"|T[^\w\s]*T|S[^\w\s]*[YSV])"
+)
+SHIPNAME_PREFIX_START_TRIGGER = r"%s|KM|E" % _VESSEL_CODE
+SHIPNAME_PREFIX_TRIGGER = r" %s|[/\\]|MFV|MPV|HMS|LPG|LNG|SF" % _VESSEL_CODE
+SHIPNAME_INFIX_TRIGGER = r"NO| N|&|STA"
+SHIPNAME_NUMBER_TRIGGER = r" [A-Z]+$|[1-5](?:ST|ND|RD|TH) |HA?O$"
+
+DIGITS = "0123456789"
+
+
+class ShipnameEngine(object):
+    """
+    Compiled rule set behind normalize_shipname(). All patterns are compiled
+    once when the engine is built. Rules that never interact are fused into
+    a single pass (number words, ordinals, HO/HAO suffixes) and groups of
+    rules are skipped as a whole when the name has none of their triggers.
+    The tail of the normalization (roman numerals, special characters and
+    digits) is made of table lookups and string methods.
     """
 
-    if (name is None) | (name != name) | (name == ""):
-        return None
+    def __init__(self):
+        self.prefix_rules = SHIPNAME_PREFIX_RULES
+        self.parentheses_rules = SHIPNAME_PARENTHESES_RULES
+        self.infix_rules = SHIPNAME_INFIX_RULES
+
+        #
+        # A name without any trigger of a group goes through the whole
+        # group unchanged, so one search decides for all of its rules
+        self.prefix_start_trigger = re.compile(SHIPNAME_PREFIX_START_TRIGGER)
+        self.prefix_trigger = re.compile(SHIPNAME_PREFIX_TRIGGER)
+        self.infix_trigger = re.compile(SHIPNAME_INFIX_TRIGGER)
+        self.number_trigger = re.compile(SHIPNAME_NUMBER_TRIGGER)
+
+        #
+        # At most one number word can end a name, so the rules
+        # for each number are fused into one lookup
+        self.number_words = {}
+        for digits, words in SHIPNAME_NUMBER_WORDS:
+            for word in words:
+                self.number_words[word] = digits
+
+        self.ordinals = dict(SHIPNAME_ORDINALS)
+        self.ordinal_pattern = re.compile(
+            "|".join(re.escape(k) for k in self.ordinals)
+        )
+
+        #
+        # Country specific appendix (S. Korea and China)
+        self.suffix_pattern = re.compile(r"\d+\s*HA?O$")
+
+        #
+        # The last word of a name follows white spaces, a dash, or a dot
+        # after three capital letters. Only a whole last word made of a
+        # roman numeral is deromanized.
+        self.roman_numerals = dict(SHIPNAME_ROMAN_NUMERALS)
+        self.roman_pattern = re.compile(
+            r"(?:^|(?<=\s)|(?<=-)|(?<=[A-Z]{3}\.))(%s)$"
+            % "|".join(sorted(self.roman_numerals, key=len, reverse=True))
+        )
+
+        #
+        # Names are plain ASCII once transliterated, so removing the
+        # special characters [\W_] comes down to deleting these code points
+        self.special_chars = {
+            c: None for c in range(128) if re.match(r"[\W_]", chr(c))
+        }
+
+    def _replace_roman(self, m):
+        return self.roman_numerals[m.group(1)]
+
+    def _replace_ordinal(self, m):
+        return self.ordinals[m.group(0)]
+
+    def has_prefix(self, name):
+        """
+        Return False only if no prefix rule can change the name
+        """
+        return bool(
+            self.prefix_start_trigger.match(name)
+            or self.prefix_trigger.search(name)
+        )
+
+    def has_infix(self, name):
+        """
+        Return False only if no infix rule (NO., &, STA) can change the name
+        """
+        return self.infix_trigger.search(name) is not None
+
+    def has_number(self, name):
+        """
+        Return False only if replace_numbers() cannot change the name
+        """
+        return self.number_trigger.search(name) is not None
+
+    def replace_number_words(self, name):
+        """
+        Turn numbers in letters at the end of the name into digits
+        """
+        head, space, word = name.rpartition(" ")
+        digits = self.number_words.get(word) if space else None
+        if digits is not None:
+            return head + " " + digits
+        return name
+
+    def replace_ordinals(self, name):
+        """
+        Spell out ordinals such as 1ST, 2ND
+        """
+        if " " in name:
+            return self.ordinal_pattern.sub(self._replace_ordinal, name)
+        return name
+
+    def remove_suffix(self, name):
+        """
+        Remove country specific appendix (S. Korea and China)
+        """
+        if name.endswith("O"):
+            return self.suffix_pattern.sub(" ", name)
+        return name
+
+    def replace_numbers(self, name):
+        """
+        Turn numbers in letters at the end of the name into digits,
+        spell out ordinals and remove the country specific appendix
+
+        :param name: String, a vessel name being normalized
+        :return: String, the vessel name after the rules
+        """
+        name = self.replace_number_words(name)
+        name = self.replace_ordinals(name)
+        return self.remove_suffix(name)
+
+    def apply_rules(self, name, rules):
+        """
+        Apply the given rules in order, skipping those that cannot match
+
+        :param name: String, a vessel name being normalized
+        :param rules: Sequence of Rule
+        :return: String, the vessel name after the rules
+        """
+        for rule in rules:
+            if rule.could_match(name):
+                name = rule.pattern.sub(rule.repl, name)
+        return name
+
+    def apply_rules_removed(self, name, rules):
+        """
+        Apply the given rules in order like apply_rules(), and also return
+        the text removed by the first rule that matched
+
+        :return: Tuple, (the vessel name after the rules, the removed text
+        or None)
+        """
+        removed = None
+        for rule in rules:
+            if rule.could_match(name):
+                m = rule.pattern.search(name)
+                if m is not None:
+                    if removed is None:
+                        removed = m.group(0)
+                    name = rule.pattern.sub(rule.repl, name)
+        return name, removed
+
+    def clean(self, name):
+        """
+        Turn to upper cases and remove excessive white spaces
+        """
+        return " ".join(name.upper().split())
+
+    def deromanize(self, name):
+        """
+        Turn the last word of the name into digits if it is a roman numeral
+        """
+        if name[-1:] in ("I", "V", "X"):
+            return self.roman_pattern.sub(self._replace_roman, name, 1)
+        return name
+
+    def remove_special_chars(self, name):
+        return name.translate(self.special_chars)
+
+    def move_leading_digits(self, name):
+        """
+        Check if the name starts with digits, if yes move it to the end
+        """
+        if name[:1].isdigit():
+            rest = name.lstrip(DIGITS)
+            return rest + name[: len(name) - len(rest)]
+        return name
+
+    def strip_leading_zeros(self, name):
+        """
+        Remove 0s from the numbers starting with 0s at the end of the name
+        """
+        head = name.rstrip(DIGITS)
+        if name[len(head):len(head) + 1] == "0":
+            return head + name[len(head):].lstrip("0")
+        return name
+
+    def process_tail(self, name):
+        """
+        Deromanize the last word, remove all special characters, move the
+        leading digits to the end and remove the 0s starting the number at
+        the end, with table lookups and string methods (no regular
+        expressions on most names)
+
+        :param name: String, a vessel name after the rules
+        :return: String, the normalized vessel name, possibly empty
+        """
+        name = self.deromanize(name)
+        name = self.remove_special_chars(name)
+        name = self.move_leading_digits(name)
+        return self.strip_leading_zeros(name)
+
+    def normalize(self, name):
+        """
+        Normalize a ship name that is already decoded to a string.
+
+        :param name: String, a decoded vessel name
+        :return: String, a normalized vessel name or None
+        """
+        name = self.clean(name)
+
+        #
+        # Remove fishing vessel code
+        if self.has_prefix(name):
+            name = self.apply_rules(name, self.prefix_rules)
+        name = self.apply_rules(name, self.parentheses_rules)
+
+        name = self.replace_numbers(name)
+        if self.has_infix(name):
+            name = self.apply_rules(name, self.infix_rules)
+
+        name = self.process_tail(name)
+
+        if name == "":
+            return None
+        else:
+            return name
+
+    def parse(self, name):
+        """
+        Normalize a ship name that is already decoded to a string, the
+        same as normalize(), keeping the parts found on the way
+
+        :param name: String, a decoded vessel name
+        :return: ShipnameParts
+        """
+        name = self.clean(name)
+
+        prefix = None
+        if self.has_prefix(name):
+            name, prefix = self.apply_rules_removed(name, self.prefix_rules)
+            if prefix is not None:
+                prefix = prefix.translate(self.special_chars) or None
+        name, parenthetical = self.apply_rules_removed(
+            name, self.parentheses_rules
+        )
+        if parenthetical is not None:
+            parenthetical = parenthetical[1:-1].strip() or None
+
+        name = self.replace_numbers(name)
+        if self.has_infix(name):
+            name = self.apply_rules(name, self.infix_rules)
+
+        name = self.process_tail(name)
+        stem = name.rstrip(DIGITS)
+        return ShipnameParts(
+            name or None, stem or None, name[len(stem):] or None,
+            prefix, parenthetical,
+        )
+
+
+SHIPNAME_ENGINE = ShipnameEngine()
+
+#
+# Engine replacing SHIPNAME_ENGINE in the current thread or task only
+_engine_override = contextvars.ContextVar("shipname_engine", default=None)
+
+
+def shipname_engine():
+    """
+    Return the ShipnameEngine in use in the current thread or task:
+    SHIPNAME_ENGINE, unless using_engine() replaced it
+    """
+    engine = _engine_override.get()
+    return SHIPNAME_ENGINE if engine is None else engine
+
+
+@contextmanager
+def using_engine(engine):
+    """
+    Normalize ship names with another ShipnameEngine within a with block,
+    in the current thread or task only (other threads keep theirs)
+
+    :param engine: ShipnameEngine
+    """
+    token = _engine_override.set(engine)
+    try:
+        yield engine
+    finally:
+        _engine_override.reset(token)
+
+
+#
+# Normalized name, its stem and the number at its end, the vessel type code
+# and the text in parentheses or brackets that were removed
+ShipnameParts = namedtuple(
+    "ShipnameParts", ["name", "stem", "number", "prefix", "parenthetical"]
+)
+ShipnameParts.__new__.__defaults__ = (None,) * len(ShipnameParts._fields)
+
+
+def decode_shipname(name):
+    """
+    Turn a ship name of any supported type into an ASCII string by
+    transliterating nasty characters. Byte strings are decoded as utf-8
+    or, failing that, as iso-8859-1. Integers are turned to strings.
+
+    :param name: String, Bytes or Integer, an original vessel name
+    :return: String, a decoded vessel name or None for unsupported types
+    """
 
     #
     # Remove nasty characters and white spaces
     if issubclass(type(name), str):
-        name = unidecode(name)
+        return transliterate(name)
     elif isinstance(name, bytes):
         try:
-            name = unidecode(str(name, "utf-8", "strict"))
+            return transliterate(str(name, "utf-8", "strict"))
         except UnicodeDecodeError:
-            name = unidecode(str(name, "iso-8859-1", "strict"))
+            return transliterate(str(name, "iso-8859-1", "strict"))
     elif isinstance(name, int):
-        name = str(name)
+        return str(name)
     else:
         return None
 
-    #
-    # Turn to upper cases
-    name = name.upper()
-
-    name = re.sub(r"\s+", " ", name)
-    name = name.strip()
-    name = name.replace("\n", "").replace("\r", "")
 
-    #
-    # Remove fishing vessel code
-    name = re.sub(r"MFV[^\w]+", " ", name)  # fishing vessel code in English
-    name = re.sub(r"MPV[^\w]+", " ", name)  # fishing vessel code in English
-    name = re.sub(r"HMS[^\w]+", " ", name)  # fishing vessel code in English
-    name = re.sub(
-        r"LPG[/|C]*[\W]*|LNG[/|C]*[\W]*", " ", name
-    )  # LPG/LNG variations
-
-    name = re.sub(
-        r"(\s|^)F[^\w\s]*V[^\w]*", " ", name
-    )  # fishing vessel code in English (F/V, F-V, F.V, FV: etc)
-    name = re.sub(
-        r"^F[^\w\s]*B[^\w]+", " ", name
-    )  # fishing vessel code in English
-    name = re.sub(r" F[^\w\s]*B[^\w]*(\s|$)", " ", name)
-    name = re.sub(
-        r"^M[^\w\s]*P[^\w]+", " ", name
-    )  # fishing vessel code in Italy/Spain
-    name = re.sub(r" M[^\w\s]*P[^\w]*(\s|$)", " ", name)
-    name = re.sub(
-        r"^M[^\w\s]*B[^\w]+", " ", name
-    )  # fishing vessel code in Italy/Spain
-    name = re.sub(r" M[^\w\s]*B[^\w]*(\s|$)", " ", name)
-    name = re.sub(r"^G[^\w\s]*V[^\w]+", " ", name)  # mostly in UK
-    name = re.sub(r"S+F+[^\w]+G[^\w\s]*V[^\w]*", " ", name)
-    name = re.sub(r" G[^\w\s]*V[^\w]*(\s|$)", " ", name)
-    name = re.sub(r"^M[^\w\s]*V[^\w]+", " ", name)  # in English
-    name = re.sub(r" M[^\w\s]*V[^\w]*(\s|$)", " ", name)
-    name = re.sub(r"^M[^\w\s]+S[^\w]+", " ", name)  # Merchant Ship
-    name = re.sub(r" M[^\w\s]+S[^\w]*(\s|$)", " ", name)
-    name = re.sub(r"^M[^\w\s]*K[^\w]+", " ", name)  # mostly in northern europe
-    name = re.sub(r" M[^\w\s]+K[^\w]*(\s|$)", " ", name)
-    name = re.sub(r"^R[^\w\s]*V[^\w]+", " ", name)  # Research Vessel
-    name = re.sub(r" R[^\w\s]*V[^\w]*(\s|$)", " ", name)
-
-    name = re.sub(r"^T[^\w\s]*T[^\w]+", " ", name)  # Tender To
-    name = re.sub(r" T[^\w\s]*T[^\w]*($)", " ", name)
-    name = re.sub(r"^S[^\w\s]*Y[^\w]+", " ", name)  # Steam Yacht
-    name = re.sub(r" S[^\w\s]*Y[^\w]*($)", " ", name)
-    name = re.sub(r"^M[^\w\s]*F[^\w]+", " ", name)  # Motor Ferry
-    name = re.sub(r" M[^\w\s]*F[^\w]*($)", " ", name)
-    name = re.sub(r"^S[^\w\s]*S[^\w]+", " ", name)  # Steam Ship
-    name = re.sub(r" S[^\w\s]*S[^\w]*($)", " ", name)
-    name = re.sub(r"^S[^\w\s]*V[^\w]+", " ", name)  # Sailing Vessel
-    name = re.sub(r" S[^\w\s]*V[^\w]*($)", " ", name)
-    name = re.sub(r"^M[^\w\s]*T[^\w]+", " ", name)  # Motor Tanker
-    name = re.sub(r" M[^\w\s]*T[^\w]*($)", " ", name)
-    name = re.sub(r"^M[^\w\s]+Y[^\w]+", " ", name)  # Motor Yacht
-    name = re.sub(r" M[^\w\s]+Y[^\w]*($)", " ", name)
-    name = re.sub(r"^[A-Z]/[A-Z][^\w]+", " ", name)  # All other types of X/X
-    name = re.sub(r" [A-Z]/[A-Z]($)", " ", name)
-    name = re.sub(
-        r"^[A-Z]\\\\[A-Z][^\w]+", " ", name
-    )  # All other types of X\X
-    name = re.sub(r" [A-Z]\\\\[A-Z]($)", " ", name)
-    name = re.sub(r"^KM[^\w]+", " ", name)  # Indonesia K.M
-    name = re.sub(r"^E.B. ", " ", name)  # Dutch E.B. equivalent to NO.
-
-    name = re.sub(
-        r"\(.+\)", " ", name
-    )  # All additional information in parentheses
-    name = re.sub(r"\[.+\]", " ", name)
-
-    #
-    # Numbers in letters
-    name = re.sub(r" ONE($)| UNO($)| UN($)", " 1", name)
-    name = re.sub(r" TWO($)| DOS($)| DEUX($)", " 2", name)
-    name = re.sub(r" THREE($)| TRES($)| TROIS($)", " 3", name)
-    name = re.sub(r" FOUR($)| CUATRO($)| QUATRE($)", " 4", name)
-    name = re.sub(r" FIVE($)| CINCO($)| CINQ($)", " 5", name)
-    name = re.sub(r" SIX($)| SEIS($)", " 6", name)
-    name = re.sub(r" SEVEN($)| SIETE($)| SEPT($)", " 7", name)
-    name = re.sub(r" EIGHT($)| OCHO($)| HUIT($)", " 8", name)
-    name = re.sub(r" NINE($)| NUEVE($)| NEUF($)", " 9", name)
-    name = re.sub(r" TEN($)| DIEZ($)| DIX($)", " 10", name)
-    name = re.sub(r" ELEVEN($)| ONCE($)| ONZE($)", " 11", name)
-    name = re.sub(r" TWELVE($)| DOCE($)| DOUZE($)", " 12", name)
-    name = re.sub(r" THIRTEEN($)| TRECE($)| TREIZE($)", " 13", name)
-    name = re.sub(r" FOURTEEN($)| CATORCE($)| QUATORZE($)", " 14", name)
-    name = re.sub(r" FIFTEEN($)| QUINCE($)| QUINZE($)", " 15", name)
-
-    name = re.sub("1ST ", "FIRST ", name)
-    name = re.sub("2ND ", "SECOND ", name)
-    name = re.sub("3RD ", "THIRD ", name)
-    name = re.sub("4TH ", "FOURTH ", name)
-    name = re.sub("5TH ", "FIFTH ", name)
+def normalize_shipname(name):
+    """
+    Return a normalized ship name by removing all non-essential characters,
+    prefix, and suffix, and standardizing roman numerals or other parts
+    of the vessel name.
 
-    #
-    # Country specific appendix (S. Korea and China)
-    name = re.sub(r"\d+\s*HO($)", " ", name)
-    name = re.sub(r"\d+\s*HAO($)", " ", name)
+    :param name: String, an original vessel name
+    :return: String, a normalized vessel name
+    """
 
-    #
-    # Remove NO.s such in NO.5, NO5, NO:5, NO. 5, NO 5, N5, N-5 etc
-    name = re.sub(r"NO[^\w\s]*[\s]*(?=\d+)", "", name)
-    name = re.sub(r"[\s]+N[\W_0]*(?=\d+)", "", name)
-    name = re.sub(r"NO\.\s*(?=[^0-9]+)", "", name)
+    if (name is None) | (name != name) | (name == ""):
+        return None
 
-    #
-    # Turn '&' to 'AND'
-    name = re.sub(
-        r"(?<=[A-Z])\s+&\s+(?=[A-Z])", " AND ", name
-    )  # replace 'BLACK & WHITE' to 'BLACK AND WHITE'
+    name = decode_shipname(name)
+    if name is None:
+        return None
 
-    #
-    # Replace STA and STA. to SANTA
-    name = re.sub(r"(^(STA\s|STA\.)|\s(STA\s|STA\.)|\s(STA|STA\.)$)", "SANTA", name)
+    return shipname_engine().normalize(name)
 
-    #
-    # Deromanization
-    vs = re.split(r"\s+|-|(?<=[A-Z]{3})\.", name)
-    try:
-        #
-        # If last word from the name text has L/C/D/M/N then do not deromanize
-        if re.search(r"[LCDMN]", vs[-1]).group(0):
-            pass
-    except AttributeError:
-        #
-        # Try to deromanize the last word from the name text
-        try:
-            vs[-1] = roman.fromRoman(vs[-1])
-            vs[-1] = str(int(vs[-1]))
-        except roman.InvalidRomanNumeralError:
-            #
-            # No corresponding roman numeral found. Let's leave it as is.
-            pass
 
-    #
-    # Attach the deromanized digits to the end
-    name = "".join(vs)
+def normalize_shipname_parts(name):
+    """
+    Return a normalized ship name along with the parts normalize_shipname()
+    removes or changes, in a single pass over the rules
 
-    #
-    # Now, remove all special characters
-    name = re.sub(r"[\W_]", "", name)
+        normalize_shipname_parts("F/V Ocean Star 2 (ex Sea Lion)")
+        # ShipnameParts(name='OCEANSTAR2', stem='OCEANSTAR', number='2',
+        #               prefix='FV', parenthetical='EX SEA LION')
 
-    #
-    # Check if the name starts with digits, if yes move it to the end
-    obj = re.search(r"^\d+", name)
-    if obj:
-        first_digit = obj.group(0)
-        name = re.sub(r"^\d+", "", name) + str(first_digit)
+    :param name: String, an original vessel name
+    :return: ShipnameParts, name is what normalize_shipname() returns. All
+    fields are None if there is no name.
+    """
 
-    #
-    # Remove 0s from the numbers starting with 0s
-    obj = re.search(r"\d+$", name)
-    if obj:
-        last_digit = obj.group(0)
-        non_zeros = re.sub("^0+", "", last_digit)
-        name = re.sub(r"\d+$", "", name) + str(non_zeros)
+    if (name is None) | (name != name) | (name == ""):
+        return ShipnameParts()
 
-    #
-    # Remove all excessive white spaces
-    name = re.sub(r"\s+", " ", name)
+    name = decode_shipname(name)
+    if name is None:
+        return ShipnameParts()
 
-    if name == "" or name == " ":
-        return None
-    else:
-        return name
+    return shipname_engine().parse(name)
 
 
 def normalize_callsign(callsign):
@@ -235,12 +594,12 @@ def normalize_callsign(callsign):
     try:
         #
         # get rid of nasty characters, but sometimes this fails
-        callsign = unidecode(str(callsign))
+        callsign = transliterate(str(callsign))
     except UnicodeDecodeError:
         try:
-            callsign = unidecode(str(callsign.decode("utf8")))
+            callsign = transliterate(str(callsign.decode("utf8")))
         except UnicodeDecodeError:
-            callsign = unidecode(str(callsign.decode("iso_8859-1")))
+            callsign = transliterate(str(callsign.decode("iso_8859-1")))
 
     callsign = callsign.strip()
     callsign = re.sub(r"\s+", " ", callsign)
@@ -0,0 +1,237 @@
+"""
+This file provides an opt-in instrumentation of normalize_shipname() that
+counts, for each rule, how often it was checked and how often it changed
+the name, and how much time was spent in it. It helps to find the rules
+that (almost) never fire on a given data set.
+
+The default engine is never instrumented: profiling uses an
+InstrumentedShipnameEngine only for the duration of profile_rules() or
+profile_shipnames(), so normalization costs nothing extra otherwise.
+profile_rules() replaces the engine of the current thread only (see
+normalize.using_engine()), for normalize_shipname() and the functions of
+batch.py alike. While it is active, normalize_shipname_bulk() and
+normalize_many() normalize name by name in the calling process, and the
+Arrow kernels of arrow.py only send the names they cannot normalize
+themselves through the rules.
+
+    with profile_rules() as profile:
+        df["shipname_norm"] = df.shipname.apply(normalize_shipname)
+    print(profile.format())
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+import time
+
+from . import normalize
+
+RuleStats = namedtuple(
+    "RuleStats", ["rule", "calls", "hits", "seconds", "hit_rate"]
+)
+
+_SORT_KEYS = {
+    "rule": lambda s: s.rule,
+    "calls": lambda s: s.calls,
+    "hits": lambda s: s.hits,
+    "seconds": lambda s: s.seconds,
+    "hit_rate": lambda s: s.hit_rate,
+}
+
+
+class RuleProfile(object):
+    """
+    Per-rule counters: number of calls, number of calls that changed the
+    name (hits) and cumulative time in nanoseconds. Profiles are plain
+    picklable objects, so profiles collected in worker processes can be
+    sent back and merged with merge() or +.
+    """
+
+    def __init__(self, counters=None):
+        self.names = 0
+        self.counters = {}
+        if counters:
+            self.merge(counters)
+
+    def record(self, rule, changed, elapsed_ns):
+        counter = self.counters.get(rule)
+        if counter is None:
+            counter = self.counters[rule] = [0, 0, 0]
+        counter[0] += 1
+        counter[1] += changed
+        counter[2] += elapsed_ns
+
+    def merge(self, other):
+        """
+        Add the counters of another RuleProfile (or of its to_dict())
+        """
+        if isinstance(other, RuleProfile):
+            other = other.to_dict()
+        self.names += other.get("names", 0)
+        for rule, (calls, hits, elapsed_ns) in other["rules"].items():
+            counter = self.counters.setdefault(rule, [0, 0, 0])
+            counter[0] += calls
+            counter[1] += hits
+            counter[2] += elapsed_ns
+        return self
+
+    def __add__(self, other):
+        return RuleProfile().merge(self).merge(other)
+
+    def to_dict(self):
+        return {
+            "names": self.names,
+            "rules": {
+                rule: list(counter) for rule, counter in self.counters.items()
+            },
+        }
+
+    def report(self, sort_by="seconds", reverse=True):
+        """
+        :param sort_by: String, 'rule', 'calls', 'hits', 'seconds' or
+        'hit_rate'
+        :param reverse: Boolean, sort in descending order
+        :return: List of RuleStats
+        """
+        stats = [
+            RuleStats(
+                rule, calls, hits, elapsed_ns / 1e9,
+                hits / calls if calls else 0.0,
+            )
+            for rule, (calls, hits, elapsed_ns) in self.counters.items()
+        ]
+        return sorted(stats, key=_SORT_KEYS[sort_by], reverse=reverse)
+
+    def to_dataframe(self, sort_by="seconds", reverse=True):
+        """
+        :return: Pandas DataFrame with one row of RuleStats per rule
+        """
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.report(sort_by, reverse), columns=RuleStats._fields
+        )
+
+    def format(self, sort_by="seconds", reverse=True):
+        """
+        :return: String, a text table of the report
+        """
+        lines = [
+            "%-20s %10s %10s %10s %10s"
+            % ("rule", "calls", "hits", "hit_rate", "seconds")
+        ]
+        for s in self.report(sort_by, reverse):
+            lines.append(
+                "%-20s %10d %10d %10.4f %10.4f"
+                % (s.rule, s.calls, s.hits, s.hit_rate, s.seconds)
+            )
+        return "\n".join(lines)
+
+
+class InstrumentedShipnameEngine(normalize.ShipnameEngine):
+    """
+    ShipnameEngine that records every rule and step in a RuleProfile
+    """
+
+    def __init__(self, profile=None):
+        super().__init__()
+        self.profile = RuleProfile() if profile is None else profile
+
+    def _timed(self, rule, func, name):
+        start = time.perf_counter_ns()
+        result = func(name)
+        self.profile.record(
+            rule, result != name, time.perf_counter_ns() - start
+        )
+        return result
+
+    def _timed_trigger(self, rule, func, name):
+        start = time.perf_counter_ns()
+        result = func(name)
+        self.profile.record(rule, result, time.perf_counter_ns() - start)
+        return result
+
+    def clean(self, name):
+        self.profile.names += 1
+        return self._timed("CLEAN", super().clean, name)
+
+    def has_prefix(self, name):
+        return self._timed_trigger(
+            "PREFIX_TRIGGER", super().has_prefix, name
+        )
+
+    def has_infix(self, name):
+        return self._timed_trigger("INFIX_TRIGGER", super().has_infix, name)
+
+    def apply_rules(self, name, rules):
+        record = self.profile.record
+        timer = time.perf_counter_ns
+        for rule in rules:
+            start = timer()
+            if rule.could_match(name):
+                result = rule.pattern.sub(rule.repl, name)
+                record(rule.name, result != name, timer() - start)
+                name = result
+            else:
+                record(rule.name, False, timer() - start)
+        return name
+
+    def replace_number_words(self, name):
+        return self._timed(
+            "NUMBER_WORDS", super().replace_number_words, name
+        )
+
+    def replace_ordinals(self, name):
+        return self._timed("ORDINALS", super().replace_ordinals, name)
+
+    def remove_suffix(self, name):
+        return self._timed("HO_HAO_SUFFIX", super().remove_suffix, name)
+
+    def deromanize(self, name):
+        return self._timed("ROMAN_NUMERAL", super().deromanize, name)
+
+    def remove_special_chars(self, name):
+        return self._timed(
+            "SPECIAL_CHARS", super().remove_special_chars, name
+        )
+
+    def move_leading_digits(self, name):
+        return self._timed(
+            "LEADING_DIGITS", super().move_leading_digits, name
+        )
+
+    def strip_leading_zeros(self, name):
+        return self._timed(
+            "LEADING_ZEROS", super().strip_leading_zeros, name
+        )
+
+
+@contextmanager
+def profile_rules(profile=None):
+    """
+    Instrument normalize_shipname() and the batch functions within a with
+    block, in the current thread
+
+    :param profile: RuleProfile, add the counts to an existing profile
+    :return: RuleProfile, filled while the block runs
+    """
+    engine = InstrumentedShipnameEngine(profile)
+    with normalize.using_engine(engine):
+        yield engine.profile
+
+
+def profile_shipnames(names, profile=None):
+    """
+    Normalize a batch of ship names with an instrumented engine
+
+    :param names: Iterable of original vessel names
+    :param profile: RuleProfile, add the counts to an existing profile
+    :return: RuleProfile
+    """
+    engine = InstrumentedShipnameEngine(profile)
+    for name in names:
+        if (name is None) or (name != name) or (name == ""):
+            continue
+        text = normalize.decode_shipname(name)
+        if text is not None:
+            engine.normalize(text)
+    return engine.profile
@@ -0,0 +1,466 @@
+"""
+This file provides a local HTTP server for the normalization functions,
+built on asyncio and the standard library only, for services that need
+normalized values at a low latency without depending on pandas.
+
+    shipdataprocess serve --port 8000 --workers 4
+
+Each function is exposed at its own path and takes a JSON object with
+either one value or a list of values:
+
+    POST /normalize_shipname   {"value": "F/V Ocean Star II"}
+                               -> {"result": "OCEANSTAR2"}
+    POST /normalize_callsign   {"values": ["c 5b0", "NONE"]}
+                               -> {"results": ["C5B0", null]}
+    POST /standardize_imo      POST /standardize_owner
+
+Concurrent requests for a function are coalesced into micro-batches that
+are handed to a pool of worker processes: while all workers are busy,
+requests pile up and go together in the next batch, so batches grow with
+the load without delaying requests when the server is idle (a delay can
+be added with max_delay to make batches bigger). A batch that fails is
+retried request by request, so that a bad value only fails its request.
+
+    GET /stats   latency percentiles (p50, p99) of the last requests,
+                 queue depth, number of requests, values and batches
+    GET /health
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
+import time
+
+from .batch import (
+    normalize_callsign_list,
+    normalize_shipname_list,
+    standardize_owner_list,
+)
+from .standardize import standardize_imo
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+#
+# Number of most recent requests kept for the latency percentiles
+LATENCY_WINDOW = 10000
+
+
+def standardize_imo_list(values):
+    return [standardize_imo(value) for value in values]
+
+
+def _as_written(values):
+    """
+    Return the JSON numbers of values as strings: numeric call signs and
+    owners are taken as written, as the command line does
+    """
+    return [
+        str(x) if isinstance(x, (int, float)) else x for x in values
+    ]
+
+
+def normalize_callsign_json_list(values):
+    return normalize_callsign_list(_as_written(values))
+
+
+def standardize_owner_json_list(values):
+    return standardize_owner_list(_as_written(values))
+
+
+BATCH_FUNCTIONS = {
+    "normalize_shipname": normalize_shipname_list,
+    "normalize_callsign": normalize_callsign_json_list,
+    "standardize_imo": standardize_imo_list,
+    "standardize_owner": standardize_owner_json_list,
+}
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+def _run_batch(function_name, values):
+    """
+    Run in the workers: apply a batch function to a list of values
+    """
+    return BATCH_FUNCTIONS[function_name](values)
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ServerStats(object):
+    """
+    Counters and latencies of the requests handled by the server
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.values = 0
+        self.batches = 0
+        self.batch_values = 0
+        self.latencies = deque(maxlen=window)
+
+    def record_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += error
+        self.latencies.append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batch_values += size
+
+    def percentile(self, q):
+        """
+        :param q: Float, between 0 and 100
+        :return: Float, latency in milliseconds, or None without requests
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * q / 100.0))
+        return latencies[index] * 1000.0
+
+    def to_dict(self, queue_depth, in_flight):
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": self.requests,
+            "errors": self.errors,
+            "values": self.values,
+            "batches": self.batches,
+            "mean_batch_size": (
+                self.batch_values / self.batches if self.batches else 0.0
+            ),
+            "latency_ms": {
+                "p50": self.percentile(50),
+                "p99": self.percentile(99),
+                "window": len(self.latencies),
+            },
+            "queue_depth": queue_depth,
+            "in_flight_batches": in_flight,
+        }
+
+
+class MicroBatcher(object):
+    """
+    Queue of the requests for one function, dispatched to the executor in
+    batches of at most max_batch_size values, with at most slots batches
+    running at once
+    """
+
+    def __init__(
+        self, function_name, executor, slots, stats, max_batch_size, max_delay
+    ):
+        self.function_name = function_name
+        self.executor = executor
+        self.stats = stats
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.pending = deque()
+        self.queue_depth = 0
+        self.in_flight = 0
+        self._slots = slots
+        self._ready = asyncio.Event()
+        self._task = asyncio.get_event_loop().create_task(self._dispatch())
+
+    async def submit(self, values):
+        """
+        Queue values and wait for their results
+        """
+        future = asyncio.get_event_loop().create_future()
+        self.pending.append((values, future))
+        self.queue_depth += len(values)
+        self._ready.set()
+        return await future
+
+    def _take(self):
+        """
+        Take the requests of the next batch from the queue, at least one
+        """
+        batch = [self.pending.popleft()]
+        size = len(batch[0][0])
+        while self.pending and (
+            size + len(self.pending[0][0]) <= self.max_batch_size
+        ):
+            values, future = self.pending.popleft()
+            batch.append((values, future))
+            size += len(values)
+        self.queue_depth -= size
+        if not self.pending:
+            self._ready.clear()
+        return batch
+
+    async def _dispatch(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            await self._ready.wait()
+            if self.max_delay and self.queue_depth < self.max_batch_size:
+                await asyncio.sleep(self.max_delay)
+            #
+            # Requests keep coming while all workers are busy, and go
+            # together in the next batch
+            await self._slots.acquire()
+            batch = self._take()
+            self.in_flight += 1
+            loop.create_task(self._execute(batch))
+
+    async def _execute(self, batch):
+        loop = asyncio.get_event_loop()
+        try:
+            values = [value for request, _ in batch for value in request]
+            self.stats.record_batch(len(values))
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, _run_batch, self.function_name, values
+                )
+            except Exception:
+                results = None
+            if results is not None:
+                start = 0
+                for request, future in batch:
+                    if not future.done():
+                        future.set_result(
+                            results[start:start + len(request)]
+                        )
+                    start += len(request)
+                return
+
+            #
+            # Isolate the request with the bad value
+            for request, future in batch:
+                try:
+                    result = await loop.run_in_executor(
+                        self.executor, _run_batch, self.function_name, request
+                    )
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(BadRequest(repr(e)))
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def close(self):
+        self._task.cancel()
+
+
+class NormalizationServer(object):
+    """
+    HTTP/1.1 server (with keep-alive) of the batch functions
+    """
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        workers=None,
+        max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+        max_delay=0.0,
+        max_body_size=DEFAULT_MAX_BODY_SIZE,
+    ):
+        """
+        :param host: String, address to listen on
+        :param port: Integer, port to listen on, 0 for any free port
+        :param workers: Integer, number of worker processes (the number of
+        CPUs if None), or 0 to run the batches in a thread of the server
+        :param max_batch_size: Integer, maximum number of values of a batch
+        :param max_delay: Float, seconds to wait for more requests before
+        dispatching a batch that is not full
+        :param max_body_size: Integer, maximum size of a request in bytes
+        """
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_body_size = max_body_size
+        self.stats = ServerStats()
+        self.batchers = {}
+        self._executor = None
+        self._server = None
+        self._connections = {}
+
+    async def start(self):
+        """
+        Start the workers and listen, self.port is the actual port
+        """
+        if self.workers:
+            self._executor = ProcessPoolExecutor(self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(1)
+        slots = asyncio.Semaphore(max(self.workers, 1))
+        for function_name in BATCH_FUNCTIONS:
+            self.batchers[function_name] = MicroBatcher(
+                function_name,
+                self._executor,
+                slots,
+                self.stats,
+                self.max_batch_size,
+                self.max_delay,
+            )
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        #
+        # Closing the connections ends their handlers
+        for writer in list(self._connections.values()):
+            writer.close()
+        if self._connections:
+            await asyncio.wait(list(self._connections))
+        await self._server.wait_closed()
+        for batcher in self.batchers.values():
+            batcher.close()
+        self._executor.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def stats_dict(self):
+        return self.stats.to_dict(
+            queue_depth=sum(b.queue_depth for b in self.batchers.values()),
+            in_flight=sum(b.in_flight for b in self.batchers.values()),
+        )
+
+    async def _route(self, method, path, body):
+        """
+        :return: Tuple (status, JSON-serializable payload)
+        """
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/stats":
+            return 200, self.stats_dict()
+        if path == "/health":
+            return 200, {"status": "ok"}
+        batcher = self.batchers.get(path.lstrip("/"))
+        if batcher is None:
+            return 404, {"error": "Unknown path: %s" % path}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except ValueError as e:
+            raise BadRequest("Invalid JSON: %s" % e)
+        if isinstance(payload, dict) and "values" in payload:
+            values = payload["values"]
+            if not isinstance(values, list):
+                raise BadRequest("values must be a list")
+            self.stats.values += len(values)
+            results = await batcher.submit(values) if values else []
+            return 200, {"results": results}
+        if isinstance(payload, dict) and "value" in payload:
+            self.stats.values += 1
+            results = await batcher.submit([payload["value"]])
+            return 200, {"result": results[0]}
+        raise BadRequest('Send {"value": ...} or {"values": [...]}')
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ConnectionError,
+                ):
+                    break
+                start = time.perf_counter()
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    #
+                    # The body cannot be skipped to read the next request
+                    status, payload = 400, {"error": "Invalid Content-Length"}
+                    keep_alive = False
+                elif length > self.max_body_size:
+                    status, payload = 413, {"error": "Request too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    try:
+                        status, payload = await self._route(
+                            method, path, body
+                        )
+                    except BadRequest as e:
+                        status, payload = 400, {"error": str(e)}
+
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    (
+                        "HTTP/1.1 %d %s\r\n"
+                        "Content-Type: application/json\r\n"
+                        "Content-Length: %d\r\n"
+                        "Connection: %s\r\n\r\n"
+                        % (
+                            status,
+                            _REASONS[status],
+                            len(data),
+                            "keep-alive" if keep_alive else "close",
+                        )
+                    ).encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if path.rstrip("/") != "/stats":
+                    self.stats.record_request(
+                        time.perf_counter() - start, error=status != 200
+                    )
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, **kwargs):
+    """
+    Run a NormalizationServer until interrupted
+    """
+    server = NormalizationServer(host, port, workers, **kwargs)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,64 @@
+"""
+This file provides the transliteration of names to ASCII used by the
+normalization and standardization functions. It gives the same result as
+unidecode() but skips plain ASCII names, checked for each value or for a
+whole column at once, and remembers the transliteration of each non-ASCII
+character, so that the characters of Cyrillic, Greek or CJK names that
+come up again and again are only looked up once.
+"""
+
+from unidecode import unidecode
+
+
+class CharacterMemo(dict):
+    """
+    Mapping of characters to their transliteration, filled on first use.
+    unidecode() transliterates each character on its own, so joining the
+    transliterations of the characters gives the same string.
+    """
+
+    def __missing__(self, char):
+        ascii_char = unidecode(char)
+        self[char] = ascii_char
+        return ascii_char
+
+
+CHARACTERS = CharacterMemo()
+
+
+def transliterate(text):
+    """
+    Return text transliterated to ASCII, the same as unidecode(text)
+
+    :param text: String
+    :return: String, text itself if it is already plain ASCII
+    """
+    if text.isascii():
+        return text
+    return "".join(map(CHARACTERS.__getitem__, text))
+
+
+def is_ascii_column(values):
+    """
+    Return True if all values are plain ASCII strings, checked in one go
+
+    :param values: List of values
+    :return: Boolean, False if any value is not a string or is not ASCII
+    """
+    try:
+        return "".join(values).isascii()
+    except TypeError:
+        return False
+
+
+def transliterate_list(texts):
+    """
+    Return a list of strings transliterated to ASCII, skipping the
+    transliteration altogether if the whole list is plain ASCII
+
+    :param texts: List of strings
+    :return: List of strings
+    """
+    if is_ascii_column(texts):
+        return list(texts)
+    return [transliterate(text) for text in texts]
@@ -0,0 +1,90 @@
+import pytest
+
+import reference_normalize
+from shipdataprocess.arrow import (
+    normalize_callsign_arrow,
+    normalize_shipname_arrow,
+)
+from test_normalize_engine import random_names
+
+pa = pytest.importorskip("pyarrow")
+
+NAMES = [
+    "f/v boat", None, "", "  ", "OCEAN STAR 007", "12 boat", "boat\x0b0",
+    "SANTA MARIA IX", "STA ROSA", "BOAT NO 5", "NORDIC", "大洋渔业 8",
+    "NUESTRA SEÑORA", "LUCKY UNO", "1ST STAR", "HAI 12 HO", "000",
+]
+
+
+def _expected(names, function):
+    return [function(x) if x is not None else None for x in names]
+
+
+def test_normalize_shipname_arrow_matches_reference():
+    names = [x for x in random_names(5000, seed=12) if isinstance(x, str)]
+    names += NAMES
+    result = normalize_shipname_arrow(pa.array(names, type=pa.string()))
+    assert result.type == pa.string()
+    assert result.to_pylist() == _expected(
+        names, reference_normalize.normalize_shipname
+    )
+    assert result.null_count == result.to_pylist().count(None)
+
+
+def test_normalize_shipname_arrow_array_types():
+    expected = _expected(NAMES, reference_normalize.normalize_shipname)
+    chunked = pa.chunked_array([NAMES[:5], NAMES[5:]], type=pa.large_string())
+    result = normalize_shipname_arrow(chunked)
+    assert isinstance(result, pa.ChunkedArray)
+    assert result.num_chunks == 2
+    assert result.to_pylist() == expected
+
+    dictionary = pa.array(NAMES * 2).dictionary_encode()
+    assert normalize_shipname_arrow(dictionary).to_pylist() == expected * 2
+
+    values = [b"f/v boat", b"\xe1gua", None]
+    assert normalize_shipname_arrow(pa.array(values)).to_pylist() == (
+        _expected(values, reference_normalize.normalize_shipname)
+    )
+    assert normalize_shipname_arrow(NAMES) == expected
+
+
+def test_normalize_callsign_arrow_matches_reference():
+    callsigns = ["abc 123", "00ab-c", "NONE", "none", "NULL", "", None,
+                 "ÑA 1", "__", "0", "u.s.a_7"]
+    expected = _expected(callsigns, reference_normalize.normalize_callsign)
+    result = normalize_callsign_arrow(pa.array(callsigns))
+    assert result.to_pylist() == expected
+    assert normalize_callsign_arrow(callsigns) == expected
+
+
+def test_normalize_callsign_arrow_binary():
+    callsigns = [b"abc 123", b"00ab-c", b"NONE", b"none", b"", None,
+                 "ÑA 1".encode("utf8"), "ÑA 1".encode("latin-1"), b"0",
+                 b"u.s.a_7", b"\x00ab"]
+    expected = [
+        reference_normalize.normalize_callsign(x.decode("utf8"))
+        if x is not None else None
+        for x in callsigns[:7]
+    ] + ["NA1", None, "USA7", "AB"]
+    for data_type in [pa.binary(), pa.large_binary()]:
+        values = pa.array(callsigns, type=data_type)
+        assert normalize_callsign_arrow(values).to_pylist() == expected
+        assert normalize_callsign_arrow(values[3:]).to_pylist() == (
+            expected[3:]
+        )
+    chunked = pa.chunked_array([callsigns[:4], callsigns[4:]])
+    assert normalize_callsign_arrow(chunked).to_pylist() == expected
+    dictionary = pa.array(callsigns).dictionary_encode()
+    assert normalize_callsign_arrow(dictionary).to_pylist() == expected
+    fixed = pa.array([b"ab-1", b"NONE"], type=pa.binary(4))
+    assert normalize_callsign_arrow(fixed).to_pylist() == ["AB1", None]
+
+
+def test_normalize_callsign_arrow_binary_without_characters():
+    for callsigns in [[None, None], [b"", None, b""], []]:
+        for data_type in [pa.binary(), pa.large_binary()]:
+            values = pa.array(callsigns, type=data_type)
+            assert normalize_callsign_arrow(values).to_pylist() == [
+                None
+            ] * len(callsigns)
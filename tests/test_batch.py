@@ -0,0 +1,185 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import reference_normalize
+from shipdataprocess.batch import (
+    decode_callsign,
+    multiline_pattern,
+    normalize_callsign_array,
+    normalize_many,
+    normalize_column,
+    normalize_shipname_bulk,
+    normalize_shipname_list,
+    normalize_shipname_series,
+)
+from test_normalize_engine import random_names
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+from corpus import generate_callsigns  # noqa: E402
+
+
+def test_normalize_shipname_list_matches_reference():
+    names = random_names(5000, seed=11)
+    expected = [reference_normalize.normalize_shipname(x) for x in names]
+    assert normalize_shipname_list(names) == expected
+
+
+def test_normalize_shipname_list_digits_and_romans():
+    names = ["12", "0012", "12 BOAT", "boat 007", "M/P x", "xxxix", "000",
+             "A-IV", "ABC.II", "AB.II", "BOATXII", "boat IIII"]
+    expected = [reference_normalize.normalize_shipname(x) for x in names]
+    assert normalize_shipname_list(names) == expected
+
+
+def test_normalize_shipname_series_keeps_nulls_and_index():
+    series = pd.Series(
+        ["f/v boat", None, float("nan"), "", 12, b"\xe1", 1.5, "#"],
+        index=[3, 3, 5, 7, 9, 11, 13, 15],
+        name="shipname",
+        dtype=object,
+    )
+    result = normalize_shipname_series(series)
+    assert list(result.index) == list(series.index)
+    assert result.name == "shipname"
+    assert result.tolist() == ["BOAT", None, None, None, "12", "A", None,
+                               None]
+
+
+def test_normalize_shipname_series_repeated_values():
+    series = pd.Series(
+        ["boat 1", 1, "boat 1", 1.0, True, None, 1, "boat i"], dtype=object
+    )
+    expected = [reference_normalize.normalize_shipname(x) for x in series]
+    assert normalize_shipname_series(series).tolist() == expected
+
+
+def test_normalize_shipname_series_string_dtypes():
+    for dtype in ["string[python]", "string[pyarrow]"]:
+        series = pd.Series(["r/v boat", None, "boat IX"], dtype=dtype)
+        result = normalize_shipname_series(series)
+        assert result.dtype == series.dtype
+        assert result[0] == "BOAT"
+        assert pd.isna(result[1])
+        assert result[2] == "BOAT9"
+
+
+def test_normalize_shipname_series_string_dtypes_match_reference():
+    names = [x for x in random_names(2000, seed=2) if isinstance(x, str)]
+    names += [None, ""]
+    expected = [reference_normalize.normalize_shipname(x) for x in names]
+    for dtype in ["str", "string[python]", "string[pyarrow]",
+                  "large_string[pyarrow]"]:
+        series = pd.Series(
+            names, dtype=dtype, index=range(7, 7 + len(names)), name="name"
+        )
+        result = normalize_shipname_series(series)
+        assert result.dtype == series.dtype
+        assert result.index.equals(series.index)
+        assert result.name == "name"
+        assert [None if pd.isna(x) else x for x in result] == expected
+
+
+def test_normalize_column_maps_back_distinct_values():
+    values = ["f/v boat", None, 1, True, 1.0, "BOAT", "f/v boat", b"\xe1",
+              float("nan"), ""]
+    series = pd.Series(values, index=range(10, 20), dtype=object)
+    result = normalize_column(series)
+    assert list(result.index) == list(series.index)
+    assert result.tolist() == [
+        reference_normalize.normalize_shipname(x) for x in values
+    ]
+    assert result.attrs["unique_ratio"] == 0.7
+
+
+def test_normalize_column_categorical():
+    result = normalize_column(["f/v boat", "BOAT", None], categorical=True)
+    assert result.dtype == "category"
+    assert list(result.cat.categories) == ["BOAT"]
+    assert result.cat.codes.tolist() == [0, 0, -1]
+
+
+def test_normalize_column_callsign_and_owner():
+    result = normalize_column(["ab-0", "NONE", None, "0ab"], kind="callsign")
+    assert result.tolist() == ["AB0", None, None, "AB"]
+
+    owners = ["ABC Fishery Co Ltd", None, "ABC Fishery Co Ltd"]
+    result = normalize_column(owners, kind="owner")
+    assert result.tolist() == ["ABC FISHERIES", None, "ABC FISHERIES"]
+
+
+def test_normalize_column_without_values():
+    assert normalize_column([None, None], kind="callsign").tolist() == [
+        None,
+        None,
+    ]
+    result = normalize_column([np.nan, np.nan], categorical=True)
+    assert result.cat.codes.tolist() == [-1, -1]
+    assert normalize_column([]).tolist() == []
+
+
+def test_normalize_many_in_order_whatever_the_workers():
+    names = random_names(3000, seed=5)
+    expected = [reference_normalize.normalize_shipname(x) for x in names]
+    for workers in [1, 2, 3]:
+        result = normalize_many(
+            names, workers=workers, chunksize=250, min_size=0
+        )
+        assert result == expected
+
+
+def test_normalize_many_series_and_small_inputs():
+    series = pd.Series(["ab-0", None, "0ab"], index=[4, 2, 0])
+    result = normalize_many(series, kind="callsign", workers=4)
+    assert result.tolist() == ["AB0", None, "AB"]
+    assert list(result.index) == [4, 2, 0]
+
+
+def test_normalize_shipname_bulk_matches_reference():
+    names = random_names(3000, seed=13) + [
+        "f/v\nboat", "boat\n", "\n", "no.\n5", "sta\nrosa", "a\r\nb ii",
+        "M/V X\n(EX Y)", "", None, "LUCKY\nUNO",
+    ]
+    expected = [reference_normalize.normalize_shipname(x) for x in names]
+    for chunksize in (1, 7, 1000, 10000):
+        assert normalize_shipname_bulk(names, chunksize) == expected
+
+
+def test_multiline_pattern_never_matches_across_names():
+    pattern = multiline_pattern(r" M[^\w\s]*V[^\w]*(\s|$)")
+    assert pattern.sub(" ", "BOAT MV\nSEA M/V X") == "BOAT \nSEA X"
+    assert multiline_pattern(r"\[.+\]").sub("", "[A\nB]") == "[A\nB]"
+    with pytest.raises(ValueError):
+        multiline_pattern(r"A[^B]")
+
+
+def test_normalize_callsign_array_matches_reference():
+    callsigns = generate_callsigns(3000, seed=20) + [
+        x for x in random_names(3000, seed=20) if isinstance(x, str)
+    ]
+    callsigns = [x for x in callsigns if x is not None]
+    callsigns += ["ÑA 1", "大洋 8", "none", "__", "0", "\x00ab", "u.s.a_7"]
+    expected = [
+        reference_normalize.normalize_callsign(x) or "" for x in callsigns
+    ]
+    result = normalize_callsign_array(np.array(callsigns))
+    assert result.dtype.kind == "U"
+    assert result.tolist() == expected
+
+    encoded = [x.encode("utf8") for x in callsigns] + [b"\xd1A 1"]
+    expected = [
+        reference_normalize.normalize_callsign(decode_callsign(x)) or ""
+        for x in encoded
+    ]
+    result = normalize_callsign_array(np.array(encoded))
+    assert result.dtype.kind == "S"
+    assert [x.decode("ascii") for x in result.tolist()] == expected
+
+    result = normalize_callsign_array(np.array([[b"c 5b0", b"NONE"]]))
+    assert result.tolist() == [[b"C5B0", b""]]
+    assert normalize_callsign_array(np.array([], dtype="S3")).size == 0
+    with pytest.raises(ValueError):
+        normalize_callsign_array(np.array([1, 2]))
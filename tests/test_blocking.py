@@ -0,0 +1,109 @@
+import pandas as pd
+
+import reference_normalize
+from shipdataprocess.blocking import (
+    blocking_keys,
+    callsign_key,
+    consonant_skeleton,
+    phonetic_code,
+    sorted_tokens,
+    split_number,
+)
+from test_normalize_engine import random_names
+
+
+def test_split_number():
+    assert split_number("OCEANSTAR12") == ("OCEANSTAR", "12")
+    assert split_number("OCEANSTAR") == ("OCEANSTAR", None)
+    assert split_number("12") == (None, "12")
+    assert split_number("A1B") == ("A1B", None)
+    assert split_number(None) == (None, None)
+
+
+def test_consonant_skeleton():
+    assert consonant_skeleton("OCEANSTAR2") == "OCNSTR"
+    assert consonant_skeleton("OCEANSTAAR") == "OCNSTR"
+    assert consonant_skeleton("MARRIAGE") == "MRG"
+    assert consonant_skeleton("AAA") == "A"
+    assert consonant_skeleton("12") == "12"
+    assert consonant_skeleton(None) is None
+
+
+def test_phonetic_code():
+    assert phonetic_code("OCEANSTAR2") == "O25236"
+    assert phonetic_code("OKEANSTAR") == "O25236"
+    assert phonetic_code("ROBERT") == "R163"
+    assert phonetic_code("RUPERT") == "R163"
+    assert phonetic_code("ASHCRAFT") == "A2613"
+    assert phonetic_code("TYMCZAK") == "T522"
+    assert phonetic_code("12") == "12"
+    assert phonetic_code(None) is None
+
+
+def test_sorted_tokens():
+    assert sorted_tokens("Star  Ocean") == "OCEAN STAR"
+    assert sorted_tokens("ocean star") == "OCEAN STAR"
+    assert sorted_tokens("Sea-Star / ()") == "SEASTAR"
+    assert sorted_tokens(b"Ni\xc3\xb1o 2") == "2 NINO"
+    assert sorted_tokens("()") is None
+    assert sorted_tokens(None) is None
+    assert sorted_tokens(float("nan")) is None
+
+
+def test_sorted_tokens_without_codes_and_parentheses():
+    for name, other in [
+        ("F/V OCEAN STAR", "OCEAN STAR"),
+        ("STAR OCEAN (EX SEA LION)", "OCEAN STAR"),
+        ("OCEAN STAR NO. 2", "OCEAN STAR 2"),
+        ("MFV Star Ocean No.2 [ex Sea]", "2 OCEAN STAR"),
+        ("OCEAN STAR N-5", "OCEAN STAR 5"),
+    ]:
+        assert sorted_tokens(name) == sorted_tokens(other)
+    assert sorted_tokens("Nino 2") == "2 NINO"
+
+
+def test_callsign_key():
+    assert callsign_key("C5B0") == "CSBO"
+    assert callsign_key("CSBO") == "CSBO"
+    assert callsign_key(None) is None
+
+
+def test_blocking_keys_match_scalar_functions():
+    names = random_names(2000, seed=16) + [None, float("nan"), ""]
+    callsigns = ["c5b0", None, "NONE", "ab 1"] * (len(names) // 4)
+    callsigns += [None] * (len(names) - len(callsigns))
+    index = range(10, 10 + len(names))
+    keys = blocking_keys(pd.Series(names, index=index), callsigns)
+    assert list(keys.columns) == [
+        "skeleton", "phonetic", "tokens", "stem", "number", "callsign"
+    ]
+    assert keys.index[0] == 10
+
+    normalized = [reference_normalize.normalize_shipname(x) for x in names]
+    assert keys.skeleton.tolist() == [
+        consonant_skeleton(x) for x in normalized
+    ]
+    assert keys.phonetic.tolist() == [phonetic_code(x) for x in normalized]
+    assert keys.tokens.tolist() == [sorted_tokens(x) for x in names]
+    assert keys.stem.tolist() == [split_number(x)[0] for x in normalized]
+    assert keys.number.tolist() == [split_number(x)[1] for x in normalized]
+    assert keys.callsign.tolist() == [
+        callsign_key(reference_normalize.normalize_callsign(x))
+        for x in callsigns
+    ]
+
+    keys = blocking_keys(normalized, normalized=True)
+    assert list(keys.columns) == ["skeleton", "phonetic", "stem", "number"]
+    assert keys.skeleton.tolist() == [
+        consonant_skeleton(x) for x in normalized
+    ]
+
+
+def test_blocking_keys_join():
+    keys = blocking_keys(["Ocean Star 2", "OKEAN STAR", "Sea", "Star Okean"])
+    pairs = keys.reset_index().merge(keys.reset_index(), on="phonetic")
+    pairs = pairs[pairs.index_x < pairs.index_y]
+    assert list(zip(pairs.index_x, pairs.index_y)) == [(0, 1)]
+    pairs = keys.reset_index().merge(keys.reset_index(), on="tokens")
+    pairs = pairs[pairs.index_x < pairs.index_y]
+    assert list(zip(pairs.index_x, pairs.index_y)) == [(1, 3)]
@@ -0,0 +1,147 @@
+import inspect
+import multiprocessing
+import pickle
+import threading
+
+import pandas as pd
+
+from shipdataprocess.batch import normalize_column, normalize_shipname_list
+from shipdataprocess.cache import (
+    LRUCache,
+    PersistentCache,
+    memoize,
+    rules_version,
+)
+from shipdataprocess.normalize import normalize_shipname
+from shipdataprocess.standardize import standardize_imo
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (2, 1, 1)
+    assert info.currsize == 2
+
+
+def test_memoize_counts_hits_and_clears():
+    cached = memoize(normalize_shipname, maxsize=10)
+    assert cached("f/v boat") == "BOAT"
+    assert cached("f/v boat") == "BOAT"
+    info = cached.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    cached.cache_clear()
+    assert cached.cache_info() == (0, 0, 0, 10, 0)
+
+
+def test_memoize_keeps_types_apart():
+    cached = memoize(normalize_shipname)
+    for value in [123, "123", True, 1, 1.0, b"\xe1", "\xe1"]:
+        assert cached(value) == normalize_shipname(value)
+        assert cached(value) == normalize_shipname(value)
+    assert cached.cache_info().currsize == 7
+
+
+def test_memoize_passes_through_uncacheable_values():
+    cached = memoize(standardize_imo)
+    assert cached(None) is None
+    assert cached(float("nan")) is None
+    series = pd.Series(["IMO 9074729", None])
+    assert cached(series).equals(standardize_imo(series))
+    assert cached.cache_info().currsize == 1
+
+
+def test_memoize_thread_safe():
+    cached = memoize(normalize_shipname, maxsize=50)
+    names = ["BOAT %d" % (i % 100) for i in range(2000)]
+
+    def work():
+        for name in names:
+            assert cached(name) == normalize_shipname(name)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = cached.cache_info()
+    assert info.hits + info.misses == 4 * len(names)
+    assert info.currsize == 50
+
+
+NAMES = ["f/v boat", "F/V BOAT", "ocean star ii", 12, "12", b"12", True,
+         None, float("nan"), "", "boat"]
+
+
+def test_persistent_cache_same_results_and_types(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    expected = normalize_shipname_list(NAMES)
+    with PersistentCache(path) as cache:
+        assert cache.normalize(NAMES) == expected
+        assert len(cache) == 8
+        assert cache.info().misses == 8
+    with PersistentCache(path) as cache:
+        assert cache.get_many("shipname", [12, "12", b"12", True]) == {
+            12: "12", "12": "12", b"12": "12"
+        }
+        assert cache.normalize(NAMES) == expected
+        assert cache.info().misses == 0
+        assert cache.get_many("callsign", ["boat"]) == {}
+        column = normalize_column(NAMES, cache=cache)
+        assert column.tolist() == expected
+
+
+def test_persistent_cache_rules_version_and_eviction(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with PersistentCache(path, maxsize=3) as cache:
+        cache.put_many("shipname", [("a", "A"), ("b", "B")])
+        cache.get_many("shipname", ["a"])
+        cache.put_many("shipname", [("c", "C"), ("d", "D")])
+        assert len(cache) == 3
+        assert cache.info().evictions == 1
+
+    with PersistentCache(path, maxsize=3, warm_start=1) as cache:
+        assert cache.memory.get(("shipname", "a")) == "A"
+        assert len(cache.memory) == 1
+        assert sorted(cache.get_many("shipname", "abcd")) == ["a", "c", "d"]
+
+    with PersistentCache(path, version="changed rules") as cache:
+        assert len(cache) == 0
+
+
+def test_rules_version_without_sources(monkeypatch):
+    def getsource(module):
+        raise OSError("could not get source code")
+
+    version = rules_version()
+    rules_version.cache_clear()
+    monkeypatch.setattr(inspect, "getsource", getsource)
+    try:
+        fallback = rules_version()
+        assert fallback != version
+        assert len(fallback) == 32
+    finally:
+        rules_version.cache_clear()
+
+
+def _read(cache):
+    return cache.get_many("shipname", ["f/v boat", "boat"])
+
+
+def test_persistent_cache_concurrent_readers(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with PersistentCache(path) as cache:
+        cache.normalize(["f/v boat", "boat"])
+        cache = pickle.loads(pickle.dumps(cache))
+        pool = multiprocessing.Pool(2)
+        try:
+            results = pool.map(_read, [cache] * 4)
+        finally:
+            pool.close()
+            pool.join()
+    assert results == [{"f/v boat": "BOAT", "boat": "BOAT"}] * 4
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from shipdataprocess.cli import main
+
+
+def test_cli_normalize_csv(tmp_path, capsys):
+    path = tmp_path / "vessels.csv"
+    path.write_text(
+        "id,name,ircs\n"
+        "1,F/V Ocean Star II,ab-12\n"
+        "2,,NONE\n"
+        '3,"M/V Sea, Lion",0x9\n'
+    )
+    main(["normalize", "--shipname", "name", "--callsign", "ircs",
+          "--chunksize", "2", "--progress", str(path)])
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [
+        "id,name,ircs,name_normalized,ircs_normalized",
+        "1,F/V Ocean Star II,ab-12,OCEANSTAR2,AB12",
+        "2,,NONE,,",
+        '3,"M/V Sea, Lion",0x9,SEALION,X9',
+    ]
+    assert "rows/s" in err
+
+
+def test_cli_normalize_ndjson(tmp_path, capsys):
+    path = tmp_path / "vessels.ndjson"
+    path.write_text(
+        '{"name": "F/V \\u00c6gir", "owner": "Aegir Fishery Co Ltd"}\n'
+        "\n"
+        '{"name": null}\n'
+    )
+    main(["normalize", "--shipname", "name", "--owner", "owner",
+          str(path)])
+    out, _ = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert records[0]["name_normalized"] == "AEGIR"
+    assert records[0]["owner_normalized"] == "AEGIR FISHERIES"
+    assert records[1] == {
+        "name": None, "name_normalized": None, "owner_normalized": None
+    }
+
+
+def test_cli_normalize_unknown_column(tmp_path):
+    path = tmp_path / "vessels.csv"
+    path.write_text("id,name\n1,boat\n")
+    with pytest.raises(SystemExit):
+        main(["normalize", "--shipname", "shipname", str(path)])
+
+
+def test_cli_normalize_ndjson_numbers(tmp_path, capsys):
+    path = tmp_path / "vessels.ndjson"
+    path.write_text('{"cs": 1, "owner": 2.5}\n{"cs": "ab-1"}\n')
+    assert main(["normalize", "--callsign", "cs", "--owner", "owner",
+                 str(path)]) == 0
+    out, _ = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert records[0]["cs_normalized"] == "1"
+    assert records[0]["owner_normalized"] == "2 5"
+    assert records[1]["cs_normalized"] == "AB1"
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ('{"cs": "a"}\n\n{"cs": \n', "Line 3: invalid JSON"),
+        ('{"cs": "a"}\n[1]\n', "Line 2: not a JSON object"),
+        ('{"cs": ["a"]}\n', "Line 1: cs is not a string or a number"),
+    ],
+)
+def test_cli_normalize_ndjson_errors(tmp_path, capsys, text, message):
+    path = tmp_path / "vessels.ndjson"
+    path.write_text(text)
+    assert main(["normalize", "--callsign", "cs", str(path)]) == 1
+    _, err = capsys.readouterr()
+    assert message in err
+    assert "usage" not in err
+
+
+def test_cli_normalize_undecodable_input(tmp_path, capsys):
+    path = tmp_path / "vessels.csv"
+    path.write_bytes(b"name\nboat\n\xff\n")
+    assert main(["normalize", "--shipname", "name", str(path)]) == 1
+    _, err = capsys.readouterr()
+    assert "utf-8" in err
+    assert "usage" not in err
+
+
+def test_cli_normalize_cache(tmp_path, capsys):
+    path = tmp_path / "vessels.csv"
+    path.write_text("name\nF/V Ocean Star II\nboat\n")
+    cache = str(tmp_path / "cache.sqlite")
+    for _ in range(2):
+        main(["normalize", "--shipname", "name", "--cache", cache,
+              str(path)])
+        out, _ = capsys.readouterr()
+        assert out.splitlines() == [
+            "name,name_normalized",
+            "F/V Ocean Star II,OCEANSTAR2",
+            "boat,BOAT",
+        ]
@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+
+import reference_normalize
+from shipdataprocess.dedup import (
+    lsh_candidate_pairs,
+    minhash_signatures,
+    near_duplicate_shipnames,
+    near_duplicates,
+)
+from test_normalize_engine import random_names
+
+
+def _qgrams(name, q=2):
+    return {name[i:i + q] for i in range(max(1, len(name) - q + 1))}
+
+
+def _jaccard(a, b):
+    a, b = _qgrams(a), _qgrams(b)
+    return len(a & b) / len(a | b)
+
+
+def _names():
+    return [
+        reference_normalize.normalize_shipname(x)
+        for x in random_names(800, seed=15)
+    ]
+
+
+def test_minhash_signatures():
+    signatures = minhash_signatures(["OCEANSTAR", "OCEANSTAR", "A", None, ""])
+    assert signatures.shape == (5, 64)
+    assert signatures.dtype == np.uint32
+    assert (signatures[0] == signatures[1]).all()
+    assert (signatures[3] == 0xFFFFFFFF).all()
+    assert (signatures[4] == 0xFFFFFFFF).all()
+    assert not (signatures[2] == 0xFFFFFFFF).all()
+    assert (minhash_signatures(["A", "AB"], q=3)[0] != 0xFFFFFFFF).all()
+
+    #
+    # The share of equal components estimates the Jaccard similarity
+    names = sorted({x for x in _names() if x})
+    rng = random.Random(15)
+    errors = []
+    for _ in range(500):
+        a, b = rng.sample(names, 2)
+        signatures = minhash_signatures([a, b], num_perm=256)
+        estimate = np.mean(signatures[0] == signatures[1])
+        errors.append(estimate - _jaccard(a, b))
+    assert abs(np.mean(errors)) < 0.01
+    assert np.max(np.abs(errors)) < 0.2
+
+
+def test_near_duplicates_matches_brute_force():
+    names = _names()
+    pairs = near_duplicates(names, threshold=0.5)
+    assert list(pairs.columns) == ["left", "right", "similarity"]
+    assert (pairs.left < pairs.right).all()
+    assert (pairs.similarity >= 0.5).all()
+    assert not pairs.duplicated(["left", "right"]).any()
+
+    found = set(zip(pairs.left, pairs.right))
+    for i, a in enumerate(names):
+        for j in range(i + 1, len(names)):
+            b = names[j]
+            if a and b and _jaccard(a, b) >= 0.8:
+                assert (i, j) in found
+            if not a or not b:
+                assert (i, j) not in found
+
+
+def test_near_duplicates_blocks():
+    names = ["OCEANSTAR2", "OCEANSTAR3", "OCEANSTAR2", "OCEANSTAR2", "SEA"]
+    flags = ["ESP", "ESP", "FRA", "ESP", "ESP"]
+    pairs = near_duplicates(names, threshold=0.5)
+    assert list(zip(pairs.left, pairs.right)) == [
+        (0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)
+    ]
+    pairs = near_duplicates(names, threshold=0.5, blocks=flags)
+    assert list(zip(pairs.left, pairs.right)) == [(0, 1), (0, 3), (1, 3)]
+    assert pairs.similarity.tolist()[1] == 1.0
+
+    pairs = near_duplicates(names, blocks=[None, "ESP", "ESP", "ESP", "ESP"])
+    assert list(zip(pairs.left, pairs.right)) == [(1, 2), (1, 3), (2, 3)]
+
+
+def test_lsh_candidate_pairs():
+    signatures = np.array(
+        [[1, 2, 3, 4], [1, 2, 5, 6], [7, 8, 3, 4], [9, 9, 9, 9]],
+        dtype=np.uint32,
+    )
+    left, right = lsh_candidate_pairs(signatures, bands=2)
+    assert list(zip(left, right)) == [(0, 1), (0, 2)]
+    left, right = lsh_candidate_pairs(signatures, bands=2, blocks=[0, 1, 0, 0])
+    assert list(zip(left, right)) == [(0, 2)]
+
+
+def test_near_duplicate_shipnames():
+    pairs = near_duplicate_shipnames(
+        ["f/v Ocean Star 2", "OCEAN STAR II", "Sea", None], threshold=0.9
+    )
+    assert list(zip(pairs.left, pairs.right)) == [(0, 1)]
+    assert pairs.similarity.tolist() == [1.0]
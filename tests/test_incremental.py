@@ -0,0 +1,146 @@
+import pandas as pd
+import pytest
+
+import reference_normalize
+from shipdataprocess.incremental import IncrementalNormalizer
+from test_normalize_engine import random_names
+
+FIELDS = {
+    "shipname_norm": ("shipname", "shipname"),
+    "callsign_norm": ("callsign", "callsign"),
+}
+
+
+def _snapshot(n=300):
+    names = random_names(n, seed=17)
+    return pd.DataFrame(
+        {
+            "id": range(n),
+            "shipname": pd.Series(names, dtype=object),
+            "callsign": pd.Series(
+                ["c%d" % (i % 50) for i in range(n)], dtype=object
+            ),
+        }
+    )
+
+
+class Counting(object):
+    def __init__(self):
+        self.rows = 0
+
+    def __call__(self, values):
+        self.rows += len(values)
+        return [reference_normalize.normalize_shipname(x) for x in values]
+
+
+def test_run_matches_full_normalization(tmp_path):
+    df = _snapshot()
+    normalizer = IncrementalNormalizer(tmp_path / "manifest", "id", FIELDS)
+    result = normalizer.run(df)
+    assert list(result.columns) == ["shipname_norm", "callsign_norm"]
+    assert result.shipname_norm.tolist() == [
+        reference_normalize.normalize_shipname(x) for x in df.shipname
+    ]
+    assert normalizer.stats.new == len(df)
+
+    #
+    # Change, remove and add rows, with a new index
+    df = df.copy()
+    df.loc[3, "shipname"] = "OCEAN STAR II"
+    df.loc[4, "callsign"] = "c 5"
+    df.loc[5, "shipname"] = None
+    df = pd.concat(
+        [df.drop([0, 1]), pd.DataFrame({"id": [1000], "shipname": ["SEA"]})]
+    )
+    df.index = range(100, 100 + len(df))
+    result = normalizer.run(df)
+    assert normalizer.stats == (len(df), 1, 3, len(df) - 4, 2)
+    assert result.index.equals(df.index)
+    assert result.shipname_norm.tolist() == [
+        reference_normalize.normalize_shipname(x) for x in df.shipname
+    ]
+    assert result.callsign_norm.tolist() == [
+        reference_normalize.normalize_callsign(x) for x in df.callsign
+    ]
+
+
+def test_only_changed_rows_are_computed(tmp_path):
+    df = _snapshot()
+    counting = Counting()
+    fields = {"shipname_norm": ("shipname", counting)}
+    path = tmp_path / "manifest"
+    IncrementalNormalizer(path, "id", fields).run(df)
+    assert counting.rows == len(df)
+
+    df.loc[7, "shipname"] = "SEA"
+    result = IncrementalNormalizer(path, "id", fields).run(df)
+    assert counting.rows == len(df) + 1
+    assert result.shipname_norm[7] == "SEA"
+
+    #
+    # 1 and '1' are different inputs
+    df.loc[8, "shipname"] = 1
+    IncrementalNormalizer(path, "id", fields).run(df)
+    df.loc[8, "shipname"] = "1"
+    IncrementalNormalizer(path, "id", fields).run(df)
+    assert counting.rows == len(df) + 3
+
+    IncrementalNormalizer(path, "id", fields).run(df)
+    assert counting.rows == len(df) + 3
+
+
+def test_new_rules_or_fields_recompute_everything(tmp_path):
+    df = _snapshot()
+    counting = Counting()
+    fields = {"shipname_norm": ("shipname", counting)}
+    path = tmp_path / "manifest"
+    IncrementalNormalizer(path, "id", fields, version="1").run(df)
+    IncrementalNormalizer(path, "id", fields, version="2").run(df)
+    assert counting.rows == 2 * len(df)
+
+    fields["other"] = ("shipname", "shipname")
+    normalizer = IncrementalNormalizer(path, "id", fields, version="2")
+    normalizer.run(df)
+    assert counting.rows == 3 * len(df)
+    assert normalizer.stats.new == len(df)
+
+
+def test_changed_functions_recompute_everything(tmp_path):
+    df = _snapshot()
+    path = tmp_path / "manifest"
+
+    def run(function):
+        normalizer = IncrementalNormalizer(
+            path, "id", {"upper": ("callsign", function)}
+        )
+        return normalizer.run(df), normalizer.stats
+
+    result, _ = run(lambda values: values.str.upper())
+    assert result.upper.tolist() == df.callsign.str.upper().tolist()
+    result, stats = run(lambda values: values.str.upper())
+    assert stats.unchanged == len(df)
+
+    result, stats = run(lambda values: values.str.lower())
+    assert stats.new == len(df)
+    assert result.upper.tolist() == df.callsign.tolist()
+    result, stats = run(lambda values: values.str.lower() + "!")
+    assert stats.new == len(df)
+
+
+def test_keys(tmp_path):
+    df = _snapshot()
+    df["part"] = df.id % 2
+    df["id"] = df.id // 2
+    normalizer = IncrementalNormalizer(
+        tmp_path / "manifest", ["id", "part"], FIELDS
+    )
+    normalizer.run(df)
+    normalizer.run(df)
+    assert normalizer.stats.unchanged == len(df)
+
+    with pytest.raises(ValueError):
+        IncrementalNormalizer(tmp_path / "other", "part", FIELDS).run(df)
+    with pytest.raises(ValueError):
+        IncrementalNormalizer(
+            tmp_path / "other", "id", {"x": ("shipname", "unknown")}
+        )
@@ -0,0 +1,117 @@
+import random
+
+import reference_normalize
+from shipdataprocess.index import ShipNameIndex, levenshtein
+from test_normalize_engine import random_names
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def _mutate(rng, name):
+    chars = list(name)
+    for _ in range(rng.randint(0, 3)):
+        i = rng.randint(0, len(chars))
+        operation = rng.choice("ids")
+        if operation == "i" or not chars:
+            chars.insert(i, rng.choice("ABCO0123"))
+        elif operation == "d":
+            del chars[min(i, len(chars) - 1)]
+        else:
+            chars[min(i, len(chars) - 1)] = rng.choice("ABCO0123")
+    return "".join(chars)
+
+
+def _names():
+    names = [
+        reference_normalize.normalize_shipname(x)
+        for x in random_names(3000, seed=14)
+    ]
+    return sorted({x for x in names if x})
+
+
+def test_levenshtein():
+    rng = random.Random(14)
+    names = _names()
+    pairs = [("", ""), ("", "AB"), ("KITTEN", "SITTING"), ("A" * 80, "B")]
+    pairs += [(x, _mutate(rng, x)) for x in names[:500]]
+    pairs += [tuple(rng.sample(names, 2)) for _ in range(500)]
+    for a, b in pairs:
+        assert levenshtein(a, b) == _levenshtein(a, b)
+
+
+def test_within_matches_brute_force():
+    rng = random.Random(15)
+    names = _names()
+    index = ShipNameIndex(names + [None, names[0]])
+    assert len(index) == len(names)
+    queries = [_mutate(rng, x) for x in rng.sample(names, 30)] + ["", "A"]
+    for query in queries:
+        distances = sorted(
+            ((x, _levenshtein(query, x)) for x in names),
+            key=lambda result: (result[1], result[0]),
+        )
+        for k in range(4):
+            expected = [result for result in distances if result[1] <= k]
+            assert index.within(query, k) == expected
+
+
+def test_within_short_queries_matches_brute_force():
+    rng = random.Random(16)
+    names = _names()
+    index = ShipNameIndex(names)
+    queries = [x[:rng.randint(2, 6)] for x in rng.sample(names, 30)]
+    queries += [_mutate(rng, x) for x in queries[:10]]
+    for query in queries:
+        nearby = [x for x in names if len(x) <= len(query) + 3]
+        distances = sorted(
+            ((x, _levenshtein(query, x)) for x in nearby),
+            key=lambda result: (result[1], result[0]),
+        )
+        for k in range(2, 4):
+            expected = [result for result in distances if result[1] <= k]
+            assert index.within(query, k) == expected
+
+
+def test_nearest():
+    index = ShipNameIndex(["OCEANSTAR2", "OCEANSTAR3", "OCEANSTAR", "SEA"])
+    assert index.nearest("OCEANSTAR2") == [("OCEANSTAR2", 0)]
+    assert index.nearest("OCEANSTR2", 2) == [
+        ("OCEANSTAR2", 1),
+        ("OCEANSTAR", 2),
+    ]
+    assert index.nearest("SEAS", 3, max_distance=1) == [("SEA", 1)]
+    assert index.nearest("XYZXYZ") == []
+    assert "SEA" in index
+    assert "SEAS" not in index
+    assert index.within_many(["SEA", "SEE"], 1) == [
+        [("SEA", 0)],
+        [("SEA", 1)],
+    ]
+    assert index.nearest_many(["OCEANSTAR4"], 2) == [
+        [("OCEANSTAR", 1), ("OCEANSTAR2", 1)]
+    ]
+
+
+def test_from_shipnames_and_save(tmp_path):
+    index = ShipNameIndex.from_shipnames(["f/v Ocean Star 2", "SEA", None])
+    assert index.names == ["SEA", "OCEANSTAR2"]
+    path = str(tmp_path / "index.pickle")
+    index.save(path)
+    loaded = ShipNameIndex.load(path)
+    assert loaded.names == index.names
+    assert loaded.within("OCEANSTAR", 1) == [("OCEANSTAR2", 1)]
+    assert ShipNameIndex([]).within("SEA", 2) == []
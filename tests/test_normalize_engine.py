@@ -0,0 +1,114 @@
+import itertools
+import random
+
+import reference_normalize
+import roman
+from shipdataprocess.normalize import (
+    SHIPNAME_ENGINE,
+    SHIPNAME_PREFIX_RULES,
+    SHIPNAME_ROMAN_NUMERALS,
+    decode_shipname,
+    normalize_shipname,
+)
+
+#
+# Pieces of names that trigger every group of rules, glued together
+# at random with separators so that rules get to interact
+TOKENS = [
+    "MFV", "MPV", "HMS", "LPG/C", "LNG", "LPG|", "F/V", "FV:", "F.V.", "F-B",
+    "FB", "M/P", "MP", "M.B", "G/V", "SFG/V", "SSF-GV", "M/V", "MV", "M.S.",
+    "M/K", "MK", "R/V", "RV", "T/T", "S.Y", "M/F", "SS", "S/S", "S/V",
+    "M.T", "M/Y", "A/B", "Z/Z", "X\\\\Y", "KM", "K.M.", "E.B.", "EB", "(EX",
+    "NAME)", "[OLD", "]", "(", ")", "ONE", "UNO", "UN", "DOS", "DEUX", "TRES",
+    "CINQ", "SEPT", "NEUF", "DIX", "ONCE", "ONZE", "DOUZE", "QUINZE", "NONE",
+    "1ST", "2ND", "3RD", "4TH", "5TH", "21ST", "HO", "HAO", "12HO", "7 HAO",
+    "NO", "NO.", "NO:", "N", "N-", "N0", "N_", "NO5", "&", "STA", "STA.",
+    "STAR", "I", "II", "IV", "IX", "XII", "XXXIX", "XL", "MCM", "VI", "V",
+    "X", "0", "007", "12", "0012", "2005", "BOAT", "SANTA", "MARIA", "SEA",
+    "STAR", "LUCKY", "OCEAN", "LONG", "XIN", "YU", "DONG", "AB", "SAN",
+    "MAR", "-", ".", "/", "\\", "'", "_", "#", ":", "*", "\t", "ÆØ", "ñ",
+    "Şé", "大洋", "НОВЫЙ",
+]
+SEPARATORS = [" ", " ", " ", "", "-", ".", "  ", "/", "\n"]
+
+
+def random_names(n, seed=20240404):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            token = rng.choice(TOKENS)
+            if rng.random() < 0.3:
+                token = token.lower()
+            parts.append(token)
+            parts.append(rng.choice(SEPARATORS))
+        names.append("".join(parts[:-1]))
+    return names
+
+
+def test_normalize_shipname_matches_reference():
+    for name in random_names(5000):
+        assert normalize_shipname(name) == (
+            reference_normalize.normalize_shipname(name)
+        ), name
+
+
+def test_normalize_shipname_matches_reference_other_types():
+    values = [
+        None, "", " ", 0, 7, 123456, 1.5, float("nan"), b"pyth\xc3\xb6n!",
+        b"\xe1 I", b"M/V \xe9 12", True,
+    ]
+    for value in values:
+        assert normalize_shipname(value) == (
+            reference_normalize.normalize_shipname(value)
+        ), value
+
+
+def test_normalize_shipname_triggers_cover_rules():
+    engine = SHIPNAME_ENGINE
+    for name in random_names(5000, seed=7):
+        name = " ".join(decode_shipname(name).upper().split())
+        if engine.apply_rules(name, engine.prefix_rules) != name:
+            assert engine.has_prefix(name), name
+        if engine.apply_rules(name, engine.infix_rules) != name:
+            assert engine.has_infix(name), name
+        if engine.replace_numbers(name) != name:
+            assert engine.has_number(name), name
+
+
+def test_normalize_shipname_triggers_skip_plain_names():
+    assert not SHIPNAME_ENGINE.has_prefix("OCEAN STAR 12")
+    assert SHIPNAME_ENGINE.has_prefix("F/V OCEAN STAR")
+
+
+def test_normalize_shipname_prefix_rules_have_unique_names():
+    names = [rule.name for rule in SHIPNAME_PREFIX_RULES]
+    assert len(names) == len(set(names))
+
+
+def test_roman_numerals_table_covers_every_deromanized_word():
+    table = dict(SHIPNAME_ROMAN_NUMERALS)
+    for length in range(1, 8):
+        for letters in itertools.product("IVX", repeat=length):
+            word = "".join(letters)
+            try:
+                expected = str(roman.fromRoman(word))
+            except roman.InvalidRomanNumeralError:
+                expected = None
+            assert table.get(word) == expected
+
+
+def test_process_tail_same_as_steps():
+    engine = SHIPNAME_ENGINE
+    for name in random_names(2000, seed=10):
+        text = decode_shipname(name)
+        if text is None:
+            continue
+        text = engine.clean(text)
+        steps = engine.strip_leading_zeros(
+            engine.move_leading_digits(
+                engine.remove_special_chars(engine.deromanize(text))
+            )
+        )
+        assert engine.process_tail(text) == steps
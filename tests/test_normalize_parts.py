@@ -0,0 +1,71 @@
+import pandas as pd
+import pyarrow as pa
+
+import reference_normalize
+from shipdataprocess.arrow import normalize_shipname_parts_arrow
+from shipdataprocess.batch import (
+    normalize_shipname_parts_frame,
+    normalize_shipname_parts_list,
+)
+from shipdataprocess.normalize import ShipnameParts, normalize_shipname_parts
+from test_normalize_engine import random_names
+
+
+def test_examples():
+    assert normalize_shipname_parts(
+        "F/V Ocean Star 2 (ex Sea Lion)"
+    ) == ("OCEANSTAR2", "OCEANSTAR", "2", "FV", "EX SEA LION")
+    assert normalize_shipname_parts("KM. SINAR 007") == (
+        "SINAR7",
+        "SINAR",
+        "7",
+        "KM",
+        None,
+    )
+    assert normalize_shipname_parts("LPG/C GAS ONE") == (
+        "GAS1",
+        "GAS",
+        "1",
+        "LPGC",
+        None,
+    )
+    parts = normalize_shipname_parts("OCEAN [BR] M/V")
+    assert (parts.prefix, parts.parenthetical) == ("MV", "BR")
+    parts = normalize_shipname_parts("123")
+    assert (parts.stem, parts.number) == (None, "123")
+    assert normalize_shipname_parts(None) == ShipnameParts()
+    assert normalize_shipname_parts("") == ShipnameParts()
+
+
+def test_name_matches_normalize_shipname():
+    names = random_names(3000, seed=19)
+    for name in names:
+        parts = normalize_shipname_parts(name)
+        assert parts.name == reference_normalize.normalize_shipname(name)
+        if parts.name is None:
+            assert (parts.stem, parts.number) == (None, None)
+        elif parts.stem is not None:
+            assert parts.stem + (parts.number or "") == parts.name
+
+
+def test_vectorized():
+    names = random_names(2000, seed=20) + [None, float("nan"), ""]
+    expected = [normalize_shipname_parts(x) for x in names]
+    assert normalize_shipname_parts_list(names) == expected
+
+    series = pd.Series(names, index=range(10, 10 + len(names)), dtype=object)
+    frame = normalize_shipname_parts_frame(series)
+    assert list(frame.columns) == list(ShipnameParts._fields)
+    assert frame.index.equals(series.index)
+    assert [
+        ShipnameParts(*row) for row in frame.itertuples(index=False)
+    ] == expected
+
+    strings = [x if isinstance(x, str) else None for x in names]
+    expected = [normalize_shipname_parts(x) for x in strings]
+    result = normalize_shipname_parts_arrow(pa.array(strings))
+    assert [ShipnameParts(**x) for x in result.to_pylist()] == expected
+    chunked = pa.chunked_array([strings[:100], strings[100:]])
+    result = normalize_shipname_parts_arrow(chunked)
+    assert result.num_chunks == 2
+    assert [ShipnameParts(**x) for x in result.to_pylist()] == expected
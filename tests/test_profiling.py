@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+
+import pandas as pd
+
+from shipdataprocess import normalize
+from shipdataprocess.batch import (
+    normalize_column,
+    normalize_many,
+    normalize_shipname_bulk,
+    normalize_shipname_list,
+    normalize_shipname_series,
+)
+from shipdataprocess.normalize import normalize_shipname
+from shipdataprocess.profiling import (
+    RuleProfile,
+    profile_rules,
+    profile_shipnames,
+)
+
+
+def test_profile_rules_counts_hits():
+    with profile_rules() as profile:
+        assert normalize_shipname("F/V OCEAN STAR IX") == "OCEANSTAR9"
+        assert normalize_shipname("BOAT") == "BOAT"
+    stats = {s.rule: s for s in profile.report()}
+    assert profile.names == 2
+    assert stats["FV"].hits == 1
+    assert stats["ROMAN_NUMERAL"].hits == 1
+    assert stats["ROMAN_NUMERAL"].calls == 2
+    assert stats["PREFIX_TRIGGER"].hits == 1
+    assert stats["CLEAN"].seconds >= 0
+
+
+def test_profile_rules_restores_engine():
+    engine = normalize.SHIPNAME_ENGINE
+    with profile_rules():
+        assert normalize.shipname_engine() is not engine
+        #
+        # Other threads keep the default engine
+        with ThreadPoolExecutor(1) as executor:
+            other = executor.submit(normalize.shipname_engine).result()
+        assert other is engine
+    assert normalize.shipname_engine() is engine
+    assert normalize.SHIPNAME_ENGINE is engine
+
+
+def test_profile_rules_counts_batch_functions():
+    names = ["F/V OCEAN STAR IX", "BOAT", None, "F/V OCEAN STAR IX"]
+    for function in [
+        normalize_shipname_list,
+        normalize_shipname_bulk,
+        lambda x: normalize_shipname_series(pd.Series(x, dtype=object)),
+        normalize_column,
+        lambda x: normalize_many(x * 50, workers=2, chunksize=10, min_size=0),
+    ]:
+        with profile_rules() as profile:
+            function(names)
+        stats = {s.rule: s for s in profile.report()}
+        assert profile.names > 0
+        assert stats["FV"].hits > 0
+        assert stats["ROMAN_NUMERAL"].hits > 0
+
+
+def test_profile_report_sorted_and_mergeable():
+    first = profile_shipnames(["M/V SEA LION", "NO. 5 BOAT", None])
+    second = pickle.loads(pickle.dumps(profile_shipnames(["HAI 12 HO"])))
+    merged = first + second
+    assert merged.names == 3
+    hits = {s.rule: s.hits for s in merged.report(sort_by="hits")}
+    assert hits["MV_START"] == 1
+    assert hits["HO_HAO_SUFFIX"] == 1
+    report = merged.report(sort_by="calls")
+    assert [s.calls for s in report] == sorted(
+        (s.calls for s in report), reverse=True
+    )
+    assert RuleProfile(merged.to_dict()).to_dict() == merged.to_dict()
+    assert len(merged.to_dataframe()) == len(report)
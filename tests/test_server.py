@@ -0,0 +1,178 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import reference_normalize
+from shipdataprocess.cli import build_parser
+from shipdataprocess.server import NormalizationServer
+from shipdataprocess.standardize import standardize_imo, standardize_owner
+from test_normalize_engine import random_names
+
+
+class RunningServer(object):
+    """
+    NormalizationServer running in the event loop of a thread
+    """
+
+    def __init__(self, **kwargs):
+        self.server = NormalizationServer(port=0, **kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self._call(self.server.start())
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def request(self, method, path, payload=None, body=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.port)
+        if payload is not None:
+            body = json.dumps(payload)
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        result = response.status, json.loads(response.read())
+        connection.close()
+        return result
+
+    def close(self):
+        self._call(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@pytest.fixture
+def server():
+    running = RunningServer(workers=0)
+    yield running
+    running.close()
+
+
+def test_functions(server):
+    names = [x for x in random_names(200, seed=18) if isinstance(x, str)]
+    status, payload = server.request(
+        "POST", "/normalize_shipname", {"values": names}
+    )
+    assert status == 200
+    assert payload["results"] == [
+        reference_normalize.normalize_shipname(x) for x in names
+    ]
+    assert server.request(
+        "POST", "/normalize_shipname", {"value": "F/V Ocean Star II"}
+    ) == (200, {"result": "OCEANSTAR2"})
+    assert server.request(
+        "POST", "/normalize_callsign", {"values": ["c 5b0", "NONE"]}
+    ) == (200, {"results": ["C5B0", None]})
+    assert server.request(
+        "POST", "/standardize_imo", {"values": ["IMO 9074729", None, "1"]}
+    ) == (
+        200,
+        {"results": [standardize_imo(x) for x in ["IMO 9074729", None, "1"]]},
+    )
+    assert server.request(
+        "POST", "/standardize_owner", {"value": "abc fishery co ltd"}
+    ) == (200, {"result": standardize_owner("abc fishery co ltd")})
+    assert server.request(
+        "POST", "/normalize_callsign", {"values": []}
+    ) == (200, {"results": []})
+    assert server.request(
+        "POST", "/normalize_callsign", {"values": [4100234, "c 5b0", None]}
+    ) == (200, {"results": ["4100234", "C5B0", None]})
+    assert server.request(
+        "POST", "/normalize_callsign", {"value": 12.5}
+    ) == (200, {"result": "125"})
+
+
+def test_errors(server):
+    assert server.request("POST", "/nope", {"value": 1})[0] == 404
+    assert server.request("GET", "/normalize_shipname")[0] == 405
+    assert server.request("POST", "/normalize_shipname", body="{")[0] == 400
+    assert server.request("POST", "/normalize_shipname", {"x": 1})[0] == 400
+    assert server.request(
+        "POST", "/normalize_shipname", {"values": "abc"}
+    )[0] == 400
+    assert server.request("GET", "/health") == (200, {"status": "ok"})
+
+
+def test_invalid_content_length(server):
+    for length in ["abc", "-5"]:
+        with socket.create_connection(("127.0.0.1", server.server.port)) as s:
+            s.sendall(
+                b"POST /normalize_shipname HTTP/1.1\r\n"
+                b"Content-Length: %s\r\n\r\n{}" % length.encode()
+            )
+            response = b""
+            while True:
+                data = s.recv(4096)
+                if not data:
+                    break
+                response += data
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"Connection: close" in response
+    assert server.request("GET", "/health") == (200, {"status": "ok"})
+
+
+def test_batches_and_stats(server):
+    callsigns = ["c%d" % i for i in range(100)]
+    callsigns[50] = [5]
+
+    def request(callsign):
+        return server.request(
+            "POST", "/normalize_callsign", {"value": callsign}
+        )
+
+    with ThreadPoolExecutor(20) as executor:
+        responses = list(executor.map(request, callsigns))
+
+    #
+    # Only the request with a bad value fails, even if batched
+    for i, (status, payload) in enumerate(responses):
+        if i == 50:
+            assert status == 400
+        else:
+            assert (status, payload) == (200, {"result": "C%d" % i})
+
+    status, stats = server.request("GET", "/stats")
+    assert status == 200
+    assert stats["requests"] == 100
+    assert stats["errors"] == 1
+    assert stats["values"] == 100
+    assert stats["batches"] <= 100
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["p99"]
+    assert stats["latency_ms"]["window"] == 100
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight_batches"] == 0
+
+
+def test_keep_alive_and_workers():
+    running = RunningServer(workers=1, max_batch_size=2)
+    try:
+        connection = http.client.HTTPConnection(
+            "127.0.0.1", running.server.port
+        )
+        for name in ["Ocean Star", "Sea Lion"]:
+            connection.request(
+                "POST",
+                "/normalize_shipname",
+                body=json.dumps({"values": [name] * 3}),
+            )
+            response = connection.getresponse()
+            assert json.loads(response.read()) == {
+                "results": [name.upper().replace(" ", "")] * 3
+            }
+        connection.close()
+    finally:
+        running.close()
+
+
+def test_serve_arguments():
+    args = build_parser().parse_args(
+        ["serve", "--port", "0", "--workers", "2", "--max-delay-ms", "1"]
+    )
+    assert (args.host, args.port, args.workers) == ("127.0.0.1", 0, 2)
+    assert (args.max_batch_size, args.max_delay_ms) == (1000, 1.0)
@@ -0,0 +1,404 @@
+import random
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shipdataprocess.standardize import (
+    extract_imo,
+    imo_checksum,
+    imo_checksum_array,
+    standardize_float,
+    standardize_float_series,
+    standardize_imo,
+    standardize_imo_series,
+    standardize_int_str,
+    standardize_int_str_series,
+    standardize_measure_series,
+)
+
+
+def _standardize_imo_apply(series):
+    """
+    standardize_imo() of a Series as it was, one value at a time
+    """
+    series = series.apply(
+        lambda x: re.sub(r"[^\d.]", "", str(x))
+        if (x == x) & (x is not None) & (x != "") & (x != 0)
+        else None
+    )
+    series = series.apply(
+        lambda x: str(int(float(x)))
+        if (x == x) & (x is not None) & (x != "") & (x != 0)
+        else None
+    )
+    return series.apply(lambda x: x if imo_checksum(x) else None)
+
+
+def _imo_values(n, seed):
+    rng = random.Random(seed)
+    values = []
+    for _ in range(n):
+        number = rng.randint(100000, 99999999)
+        values.append(
+            rng.choice(
+                [
+                    str(number),
+                    "IMO %d" % number,
+                    "IMO-%d." % number,
+                    "%d.7" % number,
+                    " %d " % number,
+                    "%d/%d" % (number, number),
+                    "IMO0009074729",
+                    ".9074729",
+                    "٩٠٧٤٧٢٩",
+                    b"%d" % number,
+                    number,
+                    -number,
+                    float(number),
+                    None,
+                    np.nan,
+                    "",
+                    "N/A",
+                    0,
+                    True,
+                ]
+            )
+        )
+    return values
+
+
+def test_standardize_imo_series_matches_apply():
+    series = pd.Series(_imo_values(5000, seed=21), dtype=object, name="imo")
+    series.index += 10
+    expected = _standardize_imo_apply(series)
+    assert expected.notna().sum() > 100
+    assert standardize_imo_series(series).equals(expected)
+    assert standardize_imo(series).equals(expected)
+    frame = pd.DataFrame({"imo": series})
+    assert standardize_imo(frame, "imo").equals(expected)
+
+    for series in [
+        pd.Series([9074729.0, np.nan, -9074729.9, 1e20, 1e-5, np.inf]),
+        pd.Series([9074729, 0, 123, 9074728]),
+        pd.Series([True, False]),
+        pd.Series([None, np.nan], dtype=object),
+        pd.Series([], dtype=object),
+    ]:
+        assert standardize_imo_series(series).equals(
+            _standardize_imo_apply(series)
+        )
+
+
+def test_standardize_imo_series_integers_and_errors():
+    series = pd.Series(["IMO 9074729", "1", None, 8712345.0], dtype=object)
+    result = standardize_imo_series(series, as_integer=True)
+    assert result.dtype == "Int64"
+    assert result.tolist() == [9074729, pd.NA, pd.NA, pd.NA]
+    assert standardize_imo_series(
+        pd.Series([1, None], dtype="Int64"), as_integer=True
+    ).isna().all()
+    result = standardize_imo_series(
+        pd.Series(["IMO 9074729", None], dtype="string")
+    )
+    assert result[0] == "9074729" and pd.isna(result[1])
+
+    #
+    # What float() does not take fails as it did
+    with pytest.raises(ValueError):
+        standardize_imo_series(pd.Series(["No."]))
+    with pytest.raises(OverflowError):
+        standardize_imo_series(pd.Series(["9" * 400]))
+
+
+def test_imo_checksum_array_matches_imo_checksum():
+    rng = random.Random(22)
+    numbers = [rng.randint(0, 12000000) for _ in range(5000)] + [
+        9074729,
+        -9074729,
+        9999999,
+        10000000,
+    ]
+    floats = [float(x) for x in numbers] + [9074729.9, np.nan, 1e20]
+    strings = [str(x) for x in numbers] + [
+        "+9074729",
+        " 9074729 ",
+        "9_074_729",
+        "٩٠٧٤٧٢٩",
+        "9074729.0",
+        "",
+        "0009074729",
+        "90\x0074729",
+        "9" * 40,
+    ]
+    for values in [
+        numbers,
+        np.array(numbers, dtype=np.int32),
+        floats,
+        strings,
+        np.array([x.encode() for x in strings if x.isascii()]),
+        np.array(strings + [None, 9074729, "9074729\x00"], dtype=object),
+        np.array(numbers + [None, 10**30], dtype=object),
+        [True, False],
+        [3772989.0, "9074729", 9074729, "3772989.0", None],
+        tuple(floats[:100] + strings[:100]),
+    ]:
+        expected = [imo_checksum(x) for x in values]
+        assert imo_checksum_array(values).tolist() == expected
+
+    assert imo_checksum_array(np.array([np.inf])).tolist() == [False]
+    assert imo_checksum_array(
+        pd.Series([9074729, None], dtype="Int64")
+    ).tolist() == [True, False]
+    assert imo_checksum_array(
+        pd.Series(["9074729", None], dtype="string")
+    ).tolist() == [True, False]
+    assert imo_checksum_array([]).tolist() == []
+    with pytest.raises(ValueError):
+        imo_checksum_array(np.zeros((2, 2)))
+
+
+def test_imo_checksum_array_of_strings():
+    rng = random.Random(23)
+    seven = [str(rng.randint(1000000, 9999999)) for _ in range(2000)]
+    others = ["9074729", "0907472", "+907472", " 907472", "907472\x00",
+              "9074 29", "907472a", " 9074729", "9074729\x00", "", "1e6"]
+    for strings in [seven, seven + others, others]:
+        expected = [imo_checksum(x) for x in strings]
+        for values in [
+            strings,
+            np.array(strings, dtype=object),
+            pd.Series(strings, dtype="str"),
+        ]:
+            assert imo_checksum_array(values).tolist() == expected
+
+
+def test_extract_imo():
+    texts = pd.Series(
+        [
+            "IMO 9074729 / ex-NAME",
+            "LR 8712345 (ex 8712348), IMO9074729",
+            None,
+            9074729,
+            "official no 19074729",
+            "907472 9",
+            "ÄÖ 8712348 ü",
+        ],
+        index=list("abcdefg"),
+        name="remarks",
+    )
+    result = extract_imo(texts)
+    assert result.index.equals(texts.index)
+    assert result.name == "remarks"
+    assert [x if x == x else None for x in result] == [
+        "9074729",
+        "8712348",
+        None,
+        "9074729",
+        None,
+        None,
+        "8712348",
+    ]
+    result = extract_imo(texts, keep="all", as_integer=True)
+    assert result.index.tolist() == ["a", "b", "b", "d", "g"]
+    assert result.tolist() == [9074729, 8712348, 9074729, 9074729, 8712348]
+    assert extract_imo(texts, as_integer=True).isna().tolist() == [
+        False,
+        False,
+        True,
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_extract_imo_matches_search_and_checksum(monkeypatch):
+    rng = random.Random(23)
+    words = ["IMO", "ex", "/", "9074729"]
+    texts = [
+        " ".join(
+            rng.choice(words + [str(rng.randint(0, 10**9))])
+            for _ in range(rng.randint(0, 6))
+        )
+        for _ in range(2000)
+    ]
+    pattern = re.compile(r"(?<![0-9])[0-9]{7}(?![0-9])")
+    expected = [
+        [int(x) for x in pattern.findall(text) if imo_checksum(x)]
+        for text in texts
+    ]
+    monkeypatch.setattr(
+        "shipdataprocess.standardize.EXTRACT_IMO_CHUNKSIZE", 300
+    )
+    result = extract_imo(texts, keep="all", as_integer=True)
+    assert result.groupby(level=0).agg(list).to_dict() == {
+        i: numbers for i, numbers in enumerate(expected) if numbers
+    }
+    with pytest.raises(ValueError):
+        extract_imo(texts, keep="last")
+
+
+def _number_values(n, seed):
+    rng = random.Random(seed)
+    values = []
+    for _ in range(n):
+        number = rng.uniform(-1e6, 1e6)
+        values.append(
+            rng.choice(
+                [
+                    "%.2f" % number,
+                    "{:,.3f}".format(number),
+                    "%d" % number,
+                    " %d " % number,
+                    "%g" % number,
+                    number,
+                    int(number),
+                    rng.choice([1e20, 1.5e-5, -0.0, 7.0]),
+                    "No. %d" % number,
+                    "0",
+                    "",
+                    0,
+                    None,
+                    np.nan,
+                ]
+            )
+        )
+    return values
+
+
+def test_standardize_float_series_matches_standardize_float():
+    values = [
+        x for x in _number_values(3000, seed=24)
+        if not isinstance(x, str) or "No" not in x
+    ]
+    series = pd.Series(values, dtype=object, name="length")
+    result = standardize_float_series(series)
+    assert result.dtype == "Float64"
+    assert result.name == "length"
+    expected = standardize_float(series)
+    assert result.isna().tolist() == expected.isna().tolist()
+    assert result.dropna().tolist() == expected.dropna().tolist()
+
+    result = standardize_float_series(
+        pd.Series(["1,234.5", "abc", "0", True, "1.2.3"], dtype=object)
+    )
+    assert result.tolist() == [1234.5, pd.NA, 0.0, pd.NA, pd.NA]
+    for series in [
+        pd.Series([1.5, 0.0, np.nan, -2.0]),
+        pd.Series([0, 3]),
+        pd.Series(["1,5", "", "2"], dtype="string"),
+    ]:
+        expected = standardize_float(series)
+        assert standardize_float_series(series).astype(float).equals(
+            expected.astype(float)
+        )
+
+
+def test_standardize_float_series_parses_each_row_alike():
+    values = ["1_000", " 12 ", "1e3", "inf", "-Infinity", "nan"]
+    expected = [1000.0, 12.0, 1000.0, pd.NA, pd.NA, pd.NA]
+    assert standardize_float_series(pd.Series(values)).tolist() == expected
+    assert standardize_float_series(
+        pd.Series(values + ["abc", ""])
+    ).tolist() == expected + [pd.NA, pd.NA]
+    assert standardize_float_series(
+        pd.Series([np.inf, -np.inf, 2.5])
+    ).tolist() == [pd.NA, pd.NA, 2.5]
+
+
+def test_standardize_int_str_series_matches_standardize_int_str():
+    values = _number_values(3000, seed=25) + ["1.2.3", "٣", "9" * 30]
+    series = pd.Series(values, dtype=object, index=range(5, 5 + len(values)))
+    result = standardize_int_str_series(series)
+    assert result.dtype == "Int64"
+    assert result.index.equals(series.index)
+    expected = standardize_int_str(series.iloc[:-1])
+    assert result.iloc[:-1].tolist() == [
+        int(x) if isinstance(x, str) else pd.NA for x in expected
+    ]
+    assert result.iloc[-1] is pd.NA
+
+    for series in [
+        pd.Series([1e20, -3.7, 0.0, np.nan, 1.5e-5, np.inf]),
+        pd.Series([0, 12, -7]),
+        pd.Series([True, False]),
+    ]:
+        expected = [
+            int(x) if isinstance(x, str) and x else pd.NA
+            for x in standardize_int_str(series)
+        ]
+        assert standardize_int_str_series(series).tolist() == expected
+
+
+def test_standardize_measure_series():
+    series = pd.Series(
+        ["24.5 m", "80 ft", " 24,5M ", "1,234.5", "1.234,5", "1,234",
+         "1.234.567", "12", "0", "", None, 7, 0.0, "n/a", "1,2,3", "12 kg"],
+        dtype=object,
+        index=range(10, 26),
+        name="length",
+    )
+    result = standardize_measure_series(series, "length")
+    assert result.values.name == "length"
+    assert result.values.index.equals(series.index)
+    assert result.values.tolist() == pytest.approx(
+        [24.5, 24.384, 24.5, 1234.5, 1234.5, 1234.0, 1234567.0, 12.0]
+        + [np.nan] * 3 + [7.0] + [np.nan] * 4,
+        nan_ok=True,
+    )
+    assert result.unparseable == 3
+
+    result = standardize_measure_series(
+        pd.Series(["350 HP", "257 kW", "1 MW", "100 cv", "120 GT"]), "power"
+    )
+    assert result.values.tolist() == pytest.approx(
+        [260.99495, 257.0, 1000.0, 73.549875, np.nan], nan_ok=True
+    )
+    assert result.unparseable == 1
+
+    result = standardize_measure_series(
+        pd.Series(["1.234", "1,5 grt", "2.5"]), "tonnage", decimal=","
+    )
+    assert result.values.tolist() == pytest.approx(
+        [1234.0, 1.5, np.nan], nan_ok=True
+    )
+    assert result.unparseable == 1
+
+    result = standardize_measure_series(
+        pd.Series([10.0, 0.0, np.nan]), "length", unit="FT"
+    )
+    assert result.values.tolist() == pytest.approx(
+        [3.048, np.nan, np.nan], nan_ok=True
+    )
+    assert result.unparseable == 0
+
+    with pytest.raises(ValueError):
+        standardize_measure_series(series, "speed")
+    with pytest.raises(ValueError):
+        standardize_measure_series(series, "length", unit="kW")
+    with pytest.raises(ValueError):
+        standardize_measure_series(series, "length", decimal=";")
+
+
+def test_standardize_measure_series_parses_each_value_alike():
+    rng = random.Random(25)
+    values = [
+        rng.choice(["%.1f m", "%d ft", "%d", "%d,5 m", "%.2f'", "No. %d"])
+        % rng.uniform(1, 5000)
+        for _ in range(500)
+    ] + ["", "  ", None, 12.5]
+    series = pd.Series(values, dtype=object)
+    result = standardize_measure_series(series, "length")
+    parsed = [
+        standardize_measure_series(pd.Series([x], dtype=object), "length")
+        for x in values
+    ]
+    assert result.values.tolist() == pytest.approx(
+        [x.values[0] for x in parsed], nan_ok=True
+    )
+    assert result.unparseable == sum(x.unparseable for x in parsed)
+    assert result.unparseable == sum(
+        isinstance(x, str) and x.startswith("No") for x in values
+    )
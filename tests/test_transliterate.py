@@ -0,0 +1,68 @@
+# coding: utf-8
+import pandas as pd
+from unidecode import unidecode
+
+from shipdataprocess.batch import normalize_shipname_list
+from shipdataprocess.normalize import normalize_shipname
+from shipdataprocess.standardize import standardize_owner
+from shipdataprocess.transliterate import (
+    CHARACTERS,
+    is_ascii_column,
+    transliterate,
+    transliterate_list,
+)
+
+from tests.test_normalize_engine import random_names
+
+TEXTS = [
+    "OCEAN STAR",
+    "NUESTRA SEÑORA",
+    "大洋渔业 8",
+    "КАПИТАН ДРАНИЦЫН",
+    "ΑΓΙΟΣ ΝΙΚΟΛΑΟΣ",
+    "제3오룡호",
+    "SÆBJØRG ÇEŞME",
+    "البحر",
+    "",
+]
+
+
+def test_transliterate_same_as_unidecode():
+    for text in TEXTS:
+        assert transliterate(text) == unidecode(text)
+    assert transliterate_list(TEXTS) == [unidecode(x) for x in TEXTS]
+
+
+def test_transliterate_skips_ascii_and_remembers_characters():
+    text = "OCEAN STAR"
+    assert transliterate(text) is text
+    transliterate("КАПИТАН")
+    assert CHARACTERS["К"] == "K"
+
+
+def test_is_ascii_column():
+    assert is_ascii_column(["OCEAN", "STAR"])
+    assert is_ascii_column([])
+    assert not is_ascii_column(["OCEAN", "SEÑORA"])
+    assert not is_ascii_column(["OCEAN", b"STAR"])
+    assert not is_ascii_column(["OCEAN", 12])
+
+
+def test_ascii_fast_path_same_results():
+    names = random_names(2000, seed=9) + TEXTS
+    ascii_names = [x for x in names if isinstance(x, str) and x.isascii()]
+    for column in (names, ascii_names):
+        assert normalize_shipname_list(column) == [
+            normalize_shipname(x) for x in column
+        ]
+
+
+def test_standardize_owner_ascii_column():
+    owners = ["Ocean Fishery Co Ltd", "Sea (Pty) Ltd", None]
+    non_ascii = owners + ["Pesquera Señora SA", "ОАО ФЛОТ"]
+    for column in (owners, non_ascii):
+        result = standardize_owner(pd.Series(column, dtype=object))
+        result = result.astype(object).where(result.notna(), None)
+        assert result.tolist() == [
+            standardize_owner(x) if x is not None else None for x in column
+        ]